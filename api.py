@@ -1,53 +1,102 @@
-from flask import Flask, jsonify
-from threading import Thread
-import subprocess
+import discord
+from aiohttp import web
+
 from config import config
+from services import ShardState, current_cluster, render_metrics, shard_states
+from services.exposition import CONTENT_TYPE
+
+BOT_KEY = web.AppKey("bot", discord.Client)
+
+
+def shard_health(shard: ShardState) -> dict:
+    healthy = (
+        shard.connected
+        and shard.last_heartbeat_ack is not None
+        and shard.last_heartbeat_ack <= config.server.keep_alive.max_heartbeat_age
+    )
+    return {
+        "id": shard.shard_id,
+        "healthy": healthy,
+        "connected": shard.connected,
+        "latency_ms": round(shard.latency * 1000, 2) if shard.connected else None,
+        "last_heartbeat_ack": (
+            round(shard.last_heartbeat_ack, 2)
+            if shard.last_heartbeat_ack is not None
+            else None
+        ),
+        "guilds": shard.guilds,
+        "reconnects": shard.disconnects,
+        "resumes": shard.resumes,
+    }
+
+
+async def home(request: web.Request) -> web.Response:
+    return web.Response(text="Hello, I am alive")
+
+
+async def health(request: web.Request) -> web.Response:
+    """Report the real gateway state; 503 unless ready and every shard is connected and acked recently."""
+    bot = request.app[BOT_KEY]
+    shards = [shard_health(shard) for shard in shard_states(bot)]
+    healthy = bot.is_ready() and all(shard["healthy"] for shard in shards)
 
-app = Flask("")
+    return web.json_response(
+        {
+            "status": "ok" if healthy else "unavailable",
+            "message": "I am alive" if healthy else "Gateway is not connected",
+            "ready": bot.is_ready(),
+            "guilds": len(bot.guilds),
+            "shards": shards,
+        },
+        status=200 if healthy else 503,
+    )
 
 
-@app.route("/")
-def home():
-    return "Hello, I am alive"
+async def metrics(request: web.Request) -> web.Response:
+    """Prometheus scrape endpoint."""
+    body = render_metrics(request.app[BOT_KEY])
+    return web.Response(body=body.encode(), headers={"Content-Type": CONTENT_TYPE})
 
 
-@app.route("/health")
-def health():
-    return jsonify({"status": "ok", "message": "I am alive"}), 200
+def create_app(bot: discord.Client) -> web.Application:
+    app = web.Application()
+    app[BOT_KEY] = bot
+    app.router.add_get("/", home)
+    app.router.add_get("/health", health)
+    app.router.add_get("/metrics", metrics)
+    return app
 
 
-def run():
-    """Run the Flask application with configured settings"""
+async def keep_alive(bot: discord.Client) -> web.AppRunner | None:
+    """Start the keep-alive server on the running loop if enabled in cloud environment.
+
+    Returns the runner to clean up on shutdown, or ``None`` when disabled or
+    when the port cannot be bound, so the bot still connects without it.
+    """
     keep_alive_config = config.server.keep_alive
-    try:
-        if config.server.is_cloud_hosted:
-            server = subprocess.Popen(
-                [
-                    "gunicorn",
-                    "-w",
-                    "4",  # 4 worker processes
-                    "-b",
-                    f"{keep_alive_config.host}:{keep_alive_config.port}",
-                    "api:app",
-                ]
-            )
-            return server
-    except Exception:
-        # Fallback to Flask development server
-        app.run(host=keep_alive_config.host, port=int(keep_alive_config.port))
-
-
-def keep_alive() -> None:
-    """Start the keep-alive service if enabled in cloud environment"""
-    if (
+    if not (
         config.server.environment != "development"
         and config.server.is_cloud_hosted
-        and config.server.keep_alive.enabled
+        and keep_alive_config.enabled
     ):
-        t = Thread(target=run)
-        t.start()
+        print("Keep-alive service is disabled or not in cloud environment")
+        return None
+
+    port = int(keep_alive_config.port)
+    if current_cluster is not None:
+        # Clusters share a host, so each one listens on its own port
+        port += current_cluster.cluster_id
+
+    runner = web.AppRunner(create_app(bot), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, keep_alive_config.host, port)
+    try:
+        await site.start()
+    except OSError as e:
         print(
-            f"Keep-alive service started on {config.server.keep_alive.host}:{config.server.keep_alive.port}"
+            f"Error starting keep-alive service on {keep_alive_config.host}:{port}: {e}"
         )
-    else:
-        print("Keep-alive service is disabled or not in cloud environment")
+        await runner.cleanup()
+        return None
+    print(f"Keep-alive service started on {keep_alive_config.host}:{port}")
+    return runner
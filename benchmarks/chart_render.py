@@ -0,0 +1,115 @@
+"""Measure how long the render workers take to draw the bot's charts.
+
+Renders ``--charts`` distinct bar and line charts, shaped like the ones
+``/stats`` sends, through the same worker pool the bot uses, and reports
+the latency percentiles. Nothing goes over the network.
+
+Run from the repository root with the usual environment variables set:
+
+    python benchmarks/chart_render.py
+    python benchmarks/chart_render.py --charts 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config  # noqa: E402
+from services import heatmap_renderer  # noqa: E402
+from utils import build_chart_payload  # noqa: E402
+
+BROWSERS = ("Chrome", "Firefox", "Safari", "Edge", "Opera")
+
+
+def payloads(count: int) -> list[dict]:
+    """Alternate browser bar charts and 7-day click timelines, all different."""
+    colors = config.ui.charts.colors
+    charts = []
+    for index in range(count):
+        if index % 2:
+            clicks = {
+                browser: (index * 7 + n * 13) % 50 for n, browser in enumerate(BROWSERS)
+            }
+            backgrounds, title, chart_type = (
+                colors.browser,
+                "Browsers Analysis Chart",
+                "bar",
+            )
+        else:
+            today = date.today()
+            clicks = {
+                str(today - timedelta(days=day)): (index * 3 + day * 11) % 40
+                for day in range(7)
+            }
+            backgrounds, title, chart_type = (
+                colors.timeline,
+                "Clicks Over Time Chart",
+                "line",
+            )
+        unique = {key: value // 2 for key, value in clicks.items()}
+        charts.append(
+            build_chart_payload(
+                [clicks, unique],
+                backgrounds,
+                ["Clicks", "Unique Clicks"],
+                title,
+                chart_type,
+            )
+        )
+    return charts
+
+
+async def run(count: int, concurrency: int) -> None:
+    await heatmap_renderer.start()
+    # The first render in each worker pays for importing matplotlib
+    await asyncio.gather(
+        *(
+            heatmap_renderer.render_chart(payload)
+            for payload in payloads(heatmap_renderer.workers)
+        )
+    )
+
+    latencies: list[float] = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def render(payload: dict) -> int:
+        async with limit:
+            start = time.perf_counter()
+            png = await heatmap_renderer.render_chart(payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            return len(png)
+
+    started = time.perf_counter()
+    sizes = await asyncio.gather(*(render(payload) for payload in payloads(count)))
+    elapsed = time.perf_counter() - started
+    heatmap_renderer.shutdown()
+
+    p50, p95, p99 = (
+        statistics.quantiles(latencies, n=100)[q - 1] for q in (50, 95, 99)
+    )
+    print(
+        f"{count} charts on {heatmap_renderer.workers} workers, "
+        f"{concurrency} at a time: {count / elapsed:.1f} charts/s"
+    )
+    print(f"  latency p50 {p50:.0f} ms | p95 {p95:.0f} ms | p99 {p99:.0f} ms")
+    print(f"  average PNG size {statistics.mean(sizes) / 1024:.1f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--charts", type=int, default=100)
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="renders requested at once"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.charts, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
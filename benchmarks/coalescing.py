@@ -0,0 +1,136 @@
+"""Count the upstream calls a burst of identical /stats requests makes.
+
+Simulates ``--users`` people running ``/stats`` on the same short code at
+once: each one fetches the statistics and renders the same chart. The
+spoo.me and chart APIs are replaced by fakes that take ``--latency``
+seconds and count their calls, so nothing goes over the network.
+
+Run from the repository root with the usual environment variables set:
+
+    python benchmarks/coalescing.py
+    python benchmarks/coalescing.py --users 500 --latency 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from services import TTLCache  # noqa: E402
+from services.statistics import StatisticsService  # noqa: E402
+
+STATS = {
+    "url": "https://example.com",
+    "average_daily_clicks": 1,
+    "average_monthly_clicks": 30,
+    "average_weekly_clicks": 7,
+    "total-clicks": 30,
+    "total_unique_clicks": 10,
+    "max-clicks": None,
+    "last-click": "2024-01-30 12:00:00",
+    "last-click-browser": "Firefox",
+    "last-click-os": "Linux",
+    "creation-date": "2024-01-01",
+    "browser": {"Firefox": 30},
+    "os_name": {"Linux": 30},
+    "country": {"India": 30},
+    "referrer": {},
+    "counter": {"2024-01-30": 30},
+    "unique_browser": {"Firefox": 10},
+    "unique_os_name": {"Linux": 10},
+    "unique_country": {"India": 10},
+    "unique_referrer": {},
+    "unique_counter": {"2024-01-30": 10},
+    "expired": False,
+}
+
+
+class FakeSpooClient:
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.calls: int = 0
+
+    async def fetch_statistics(self, short_code: str, password: str = None) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return STATS
+
+
+class FakeChartResponse:
+    status = 200
+
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+
+    async def __aenter__(self) -> "FakeChartResponse":
+        await asyncio.sleep(self.latency)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+    async def json(self, content_type=None) -> dict:
+        return {"success": True, "url": "https://example.com/chart.png"}
+
+
+class FakeChartSession:
+    def __init__(self, latency: float) -> None:
+        self.latency: float = latency
+        self.calls: int = 0
+
+    def post(self, url: str, json: dict) -> FakeChartResponse:
+        self.calls += 1
+        return FakeChartResponse(self.latency)
+
+
+async def stats_command(service: StatisticsService, short_code: str) -> None:
+    stats = await service.get(short_code)
+    await utils.generate_chart(
+        data=[stats.browsers_analysis, stats.unique_browsers_analysis],
+        backgrounds=["#5865F2", "#57F287"],
+        labels=["Clicks", "Unique Clicks"],
+        title="Browsers Analysis Chart",
+        type="bar",
+    )
+
+
+async def run(users: int, latency: float) -> None:
+    client = FakeSpooClient(latency)
+    session = FakeChartSession(latency)
+    utils.get_session = lambda: session
+    service = StatisticsService(
+        client, TTLCache(max_size=16, ttl=0.001), TTLCache(max_size=16, ttl=0.001)
+    )
+
+    # A tiny TTL keeps the caches out of the way: only coalescing is measured
+    utils.chart_cache.memory.ttl = 0.001
+    utils.chart_cache.sqlite_path = ""
+
+    started = time.perf_counter()
+    await asyncio.gather(*(stats_command(service, "spike") for _ in range(users)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{users} concurrent /stats on one short code ({elapsed:.2f}s)")
+    print(f"  statistics requests: {client.calls} (shared by {service.flight.shared})")
+    print(
+        f"  chart requests:      {session.calls} "
+        f"(shared by {utils.chart_flight.shared})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="seconds per upstream call"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.latency))
+
+
+if __name__ == "__main__":
+    main()
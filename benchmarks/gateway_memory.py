@@ -0,0 +1,172 @@
+"""Compare the memory the gateway cache holds under different intents profiles.
+
+Synthetic guilds are fed straight into a discord.py connection state, the
+way GUILD_CREATE and member chunking would deliver them. No network is
+involved. Each payload only carries what the gateway would actually send
+for the profile being measured:
+
+- members are included when member chunking is on, or when the guild is
+  small enough for Discord to send them with GUILD_CREATE
+- presences are only included with the presences intent
+
+Run from the repository root with the usual environment variables set:
+
+    python benchmarks/gateway_memory.py
+    python benchmarks/gateway_memory.py --guilds 200 --members 2000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+import discord
+from discord.user import ClientUser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config  # noqa: E402
+from main import gateway_options  # noqa: E402
+from schemas import Gateway  # noqa: E402
+
+# discord.py's default large_threshold: bigger guilds arrive without members
+LARGE_THRESHOLD = 250
+
+BOT_USER = {
+    "id": "1",
+    "username": "SpooBot",
+    "discriminator": "0",
+    "avatar": None,
+    "global_name": None,
+    "bot": True,
+}
+
+PROFILES: dict[str, Gateway] = {
+    # What the bot ran with before profiles existed
+    "all (previous)": Gateway(
+        intents="all",
+        member_cache="intents",
+        chunk_guilds_at_startup=True,
+        max_messages=1000,
+        sharded=False,
+        shard_count=0,
+    ),
+    "configured": config.gateway,
+}
+
+
+def member_payload(user: dict) -> dict:
+    return {
+        "user": user,
+        "roles": [],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+def guild_payload(
+    guild_id: int, members: int, intents: discord.Intents, chunked: bool
+) -> dict:
+    users = [
+        {
+            "id": str(guild_id * 100_000 + index),
+            "username": f"member{index}",
+            "discriminator": "0",
+            "avatar": None,
+            "global_name": None,
+        }
+        for index in range(members)
+    ]
+    sent = users if chunked or members < LARGE_THRESHOLD else []
+    sent = [*sent, BOT_USER]
+
+    return {
+        "id": str(guild_id),
+        "name": f"Guild {guild_id}",
+        "member_count": members + 1,
+        "members": [member_payload(user) for user in sent],
+        "presences": [
+            {
+                "user": {"id": user["id"]},
+                "status": "online",
+                "activities": [{"name": "a game", "type": 0}],
+                "client_status": {"desktop": "online"},
+            }
+            for user in sent
+        ]
+        if intents.presences
+        else [],
+        "channels": [
+            {
+                "id": str(guild_id + index + 1),
+                "type": 0,
+                "name": f"channel-{index}",
+                "position": index,
+                "permission_overwrites": [],
+            }
+            for index in range(10)
+        ],
+        "roles": [
+            {
+                "id": str(guild_id),
+                "name": "@everyone",
+                "permissions": "0",
+                "position": 0,
+                "color": 0,
+                "hoist": False,
+                "managed": False,
+                "mentionable": False,
+            }
+        ],
+        "emojis": [],
+        "stickers": [],
+        "features": [],
+        "threads": [],
+        "voice_states": [],
+    }
+
+
+def measure(gateway: Gateway, guilds: int, members: int) -> tuple[int, int]:
+    """Return the bytes held by the connection state and the cached member count."""
+    options = gateway_options(gateway)
+    intents = options["intents"]
+    # discord.py only requests member chunks with the members intent
+    chunked = intents.members and gateway.chunk_guilds_at_startup
+
+    gc.collect()
+    tracemalloc.start()
+    client = discord.Client(**options)
+    state = client._connection
+    state.user = ClientUser(state=state, data=BOT_USER)
+
+    for index in range(guilds):
+        guild_id = (index + 1) * 10**9
+        state._add_guild_from_data(guild_payload(guild_id, members, intents, chunked))
+
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, sum(len(guild.members) for guild in client.guilds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=100)
+    parser.add_argument("--members", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.guilds} guilds x {args.members} members")
+    for name, gateway in PROFILES.items():
+        held, cached = measure(gateway, args.guilds, args.members)
+        print(
+            f"{name:<16} {held / 2**20:8.1f} MiB  {cached:>9} cached members  "
+            f"(intents={gateway.intents}, member_cache={gateway.member_cache}, "
+            f"chunk={gateway.chunk_guilds_at_startup})"
+        )
+
+
+if __name__ == "__main__":
+    main()
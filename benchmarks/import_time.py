@@ -0,0 +1,73 @@
+"""Measure how long it takes to import the bot, and what it drags in.
+
+Each target is imported in a fresh interpreter, so nothing is shared
+between runs. Run from the repository root (the config is loaded on
+import, so the usual environment variables must be set):
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 10 main py_spoo_url
+
+``py_spoo_url`` is what the bot used to import on startup for its
+statistics, and is a handy baseline for the plotting stack's cost.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES: tuple[str, ...] = (
+    "pandas",
+    "geopandas",
+    "shapely",
+    "pyproj",
+    "pyogrio",
+    "matplotlib",
+    "numpy",
+    "PIL",
+    "openpyxl",
+    "requests",
+)
+
+PROBE = """
+import importlib, json, resource, sys, time
+start = time.perf_counter()
+importlib.import_module({target!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(target: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(target=target, heavy=HEAVY_MODULES)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("targets", nargs="*", default=["main", "py_spoo_url"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for target in args.targets:
+        runs = [measure(target) for _ in range(args.runs)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss = statistics.median(run["max_rss_kb"] for run in runs) / 1024
+        heavy = ", ".join(runs[-1]["heavy"]) or "none"
+        print(
+            f"{target:<16} {seconds * 1000:8.0f} ms  {rss:7.1f} MiB RSS  heavy: {heavy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
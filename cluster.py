@@ -0,0 +1,202 @@
+"""Run the bot as several processes, each owning a slice of the shards.
+
+    python cluster.py
+
+Starts ``cluster.clusters`` copies of ``main.py`` and supervises them: a
+cluster that exits, or stops publishing its status to the shared state,
+is restarted after a delay that doubles on each crash in a row.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+from config import config
+from services.cluster import (
+    ENV_CLUSTER_ID,
+    ENV_SHARD_COUNT,
+    ENV_SHARD_IDS,
+    status_key,
+)
+from services.state import StateBackend, create_state_backend
+
+DISCORD_GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+
+# Seconds a cluster gets to shut down cleanly before it is killed
+STOP_TIMEOUT = 30
+
+# Clusters keep the supervisor's working directory, and so its config.toml
+BOT_SCRIPT = Path(__file__).resolve().parent / "main.py"
+
+
+def shard_slices(shard_count: int, clusters: int) -> list[list[int]]:
+    """Split shard ids ``0..shard_count - 1`` into ``clusters`` contiguous slices."""
+    size, extra = divmod(shard_count, clusters)
+    slices, start = [], 0
+    for index in range(clusters):
+        end = start + size + (1 if index < extra else 0)
+        slices.append(list(range(start, end)))
+        start = end
+    return slices
+
+
+async def recommended_shard_count() -> int:
+    """Ask Discord how many shards the bot should run."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            DISCORD_GATEWAY_BOT_URL,
+            headers={"Authorization": f"Bot {config.bot.bot_token}"},
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data["shards"]
+
+
+class Cluster:
+    """One supervised bot process and the shards it owns."""
+
+    def __init__(self, cluster_id: int, shard_ids: list[int], shard_count: int) -> None:
+        self.cluster_id: int = cluster_id
+        self.shard_ids: list[int] = shard_ids
+        self.shard_count: int = shard_count
+        self.process: asyncio.subprocess.Process | None = None
+        self.started_at: float = 0.0
+
+    async def start(self) -> None:
+        env = {
+            **os.environ,
+            ENV_CLUSTER_ID: str(self.cluster_id),
+            ENV_SHARD_IDS: ",".join(str(shard) for shard in self.shard_ids),
+            ENV_SHARD_COUNT: str(self.shard_count),
+        }
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, str(BOT_SCRIPT), env=env
+        )
+        self.started_at = time.time()
+        print(
+            f"Cluster {self.cluster_id} started (pid {self.process.pid}, "
+            f"shards {self.shard_ids[0]}-{self.shard_ids[-1]})"
+        )
+
+    async def stop(self) -> None:
+        if self.process is None or self.process.returncode is not None:
+            return
+
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+
+class Supervisor:
+    """Keeps every cluster running until asked to stop.
+
+    Clusters are always restarted when they exit. With ``check_status`` they
+    are also restarted when their status in the shared state goes stale,
+    which catches processes that are alive but wedged.
+    """
+
+    def __init__(
+        self, clusters: list[Cluster], state: StateBackend, check_status: bool
+    ) -> None:
+        self.clusters: list[Cluster] = clusters
+        self.state: StateBackend = state
+        self.check_status: bool = check_status
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._stopping.set)
+            except NotImplementedError:
+                pass  # Windows; Ctrl+C still ends asyncio.run
+
+        watchers = [
+            asyncio.create_task(self._watch(cluster)) for cluster in self.clusters
+        ]
+        try:
+            await self._stopping.wait()
+        finally:
+            print("Stopping clusters...")
+            for watcher in watchers:
+                watcher.cancel()
+            await asyncio.gather(*(cluster.stop() for cluster in self.clusters))
+
+    async def _is_stale(self, cluster: Cluster) -> bool:
+        if not self.check_status:
+            return False
+
+        status = await self.state.get(status_key(cluster.cluster_id))
+        last_seen = cluster.started_at
+        # Ignore the status a previous process of this cluster left behind
+        if status is not None and status["pid"] == cluster.process.pid:
+            last_seen = max(last_seen, status["updated_at"])
+        return time.time() - last_seen > config.cluster.heartbeat_timeout
+
+    async def _watch(self, cluster: Cluster) -> None:
+        cluster_config = config.cluster
+        delay = cluster_config.restart_delay
+        await cluster.start()
+
+        while True:
+            try:
+                code = await asyncio.wait_for(
+                    cluster.process.wait(), timeout=cluster_config.status_interval
+                )
+                print(f"Cluster {cluster.cluster_id} exited with code {code}")
+            except asyncio.TimeoutError:
+                if not await self._is_stale(cluster):
+                    continue
+                print(f"Cluster {cluster.cluster_id} stopped reporting, restarting it")
+                await cluster.stop()
+
+            # A cluster that stayed up for a while crashed for a new reason
+            if time.time() - cluster.started_at > cluster_config.max_restart_delay:
+                delay = cluster_config.restart_delay
+
+            print(f"Restarting cluster {cluster.cluster_id} in {delay:g}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, cluster_config.max_restart_delay)
+            await cluster.start()
+
+
+async def main() -> None:
+    cluster_config = config.cluster
+    if cluster_config.clusters > 1 and cluster_config.state_backend == "memory":
+        sys.exit(
+            "cluster.state_backend = 'memory' cannot be shared between processes; "
+            "use 'sqlite' to run more than one cluster"
+        )
+
+    shard_count = cluster_config.shard_count or await recommended_shard_count()
+    clusters = min(cluster_config.clusters, shard_count)
+    print(f"Running {shard_count} shards across {clusters} clusters")
+
+    state = create_state_backend(
+        cluster_config.state_backend, cluster_config.state_path
+    )
+    supervisor = Supervisor(
+        [
+            Cluster(cluster_id, shard_ids, shard_count)
+            for cluster_id, shard_ids in enumerate(shard_slices(shard_count, clusters))
+        ],
+        state,
+        # Statuses in a memory backend never leave the cluster's own process
+        check_status=cluster_config.state_backend != "memory",
+    )
+    try:
+        await supervisor.run()
+    finally:
+        state.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,15 +1,117 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import io
+import zipfile
 from utils_code import (
     validate_url,
     validate_string,
     validate_password,
     generate_code_snippet,
+    available_languages,
+    code_templates,
 )
 from config import config
+from services import TTLCache, phase, register_cache
 from utils import generate_command_error_embed
 
+# Rendered snippets and soft warnings, keyed by the /get-code arguments
+snippet_cache = TTLCache(max_size=config.cache.code.max_size, ttl=config.cache.code.ttl)
+register_cache("code", snippet_cache)
+
+# /get-code language choice that bundles every language into a single archive
+ALL_LANGUAGES = "All languages"
+
+
+def snippet_cache_key(
+    language: str, url: str, alias: str, password: str, max_clicks: int
+) -> tuple | None:
+    # Snippets and warnings for a password embed it verbatim, so they are never cached
+    if password is not None:
+        return None
+    return (language, url, alias, max_clicks)
+
+
+def render_code_response(
+    language: str,
+    url: str,
+    alias: str = None,
+    password: str = None,
+    max_clicks: int = None,
+) -> tuple[str, str, tuple[str, ...]]:
+    """Return ``(code, syntax, soft_errors)`` for a /get-code request, from cache when possible."""
+    key = snippet_cache_key(language, url, alias, password, max_clicks)
+    cached = snippet_cache.get(key) if key is not None else None
+    if cached is not None:
+        return cached
+
+    code, lang = generate_code_snippet(
+        language=language,
+        long_url=url,
+        alias=alias,
+        max_clicks=max_clicks,
+        password=password,
+    )
+
+    soft_errors: list[str] = []
+
+    if not validate_url(url):
+        url = url[:150] + "..." if len(url) > 150 else url
+        soft_errors.append(
+            f"- ```'{url}' is not a valid URL, the API might return an error```"
+        )
+    if alias is not None and not validate_string(alias):
+        alias = alias[:15] + "..." if len(alias) > 15 else alias
+        soft_errors.append(
+            f"- ```'{alias}' is not a valid alias, the API might return an error```"
+        )
+    if alias is not None and len(alias) > 15:
+        alias = alias[:15] + "..." if len(alias) > 15 else alias
+        soft_errors.append(
+            f"- ```'{alias}' is too long, the API will strip it to 15 characters```"
+        )
+    if password is not None and not validate_password(password):
+        password = password[:150] + "..." if len(password) > 150 else password
+        soft_errors.append(
+            f"- ```'{password}' is not a valid password, the API might return an error. Password must be atleast 8 characters long, must contain a letter and a number and a special character either '@' or '.' and cannot be consecutive```"
+        )
+
+    result = (code, lang, tuple(soft_errors))
+    if key is not None:
+        snippet_cache.set(key, result)
+    return result
+
+
+def render_code_archive(
+    url: str,
+    alias: str = None,
+    password: str = None,
+    max_clicks: int = None,
+) -> tuple[bytes, tuple[str, ...]]:
+    """Return a zip with the snippet for every language and the soft warnings."""
+    key = snippet_cache_key(ALL_LANGUAGES, url, alias, password, max_clicks)
+    cached = snippet_cache.get(key) if key is not None else None
+    if cached is not None:
+        return cached
+
+    soft_errors: tuple[str, ...] = ()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for language in available_languages:
+            code, _, soft_errors = render_code_response(
+                language=language,
+                url=url,
+                alias=alias,
+                password=password,
+                max_clicks=max_clicks,
+            )
+            archive.writestr(code_templates[language].filename, code)
+
+    result = (buffer.getvalue(), soft_errors)
+    if key is not None:
+        snippet_cache.set(key, result)
+    return result
+
 
 class genCode(commands.Cog):
     def __init__(self, bot) -> None:
@@ -22,28 +124,10 @@ class genCode(commands.Cog):
     @app_commands.guild_only()
     @app_commands.choices(
         language=[
-            app_commands.Choice(name="Python-Requests", value="Python-Requests"),
-            app_commands.Choice(name="Python-Aiohttp", value="Python-Aiohttp"),
-            app_commands.Choice(name="C", value="C"),
-            app_commands.Choice(name="C#", value="C#"),
-            app_commands.Choice(name="Clojure", value="Clojure"),
-            app_commands.Choice(name="Go", value="Go"),
-            app_commands.Choice(name="HTTP", value="HTTP"),
-            app_commands.Choice(name="Java", value="Java"),
-            app_commands.Choice(name="JavaScript-Fetch", value="JavaScript-Fetch"),
-            app_commands.Choice(
-                name="JavaScript-XMLHttpRequest", value="JavaScript-XMLHttpRequest"
-            ),
-            app_commands.Choice(name="Kotlin", value="Kotlin"),
-            app_commands.Choice(name="Node.js-Requests", value="Node.js-Requests"),
-            app_commands.Choice(name="Node.js-Axios", value="Node.js-Axios"),
-            app_commands.Choice(name="Node.js-Unirest", value="Node.js-Unirest"),
-            app_commands.Choice(name="PHP", value="PHP"),
-            app_commands.Choice(name="R", value="R"),
-            app_commands.Choice(name="Ruby", value="Ruby"),
-            app_commands.Choice(name="Shell", value="Shell"),
-            app_commands.Choice(name="Rust", value="Rust"),
-        ],
+            app_commands.Choice(name=language, value=language)
+            for language in available_languages
+        ]
+        + [app_commands.Choice(name=ALL_LANGUAGES, value=ALL_LANGUAGES)],
     )
     @app_commands.describe(
         **{
@@ -60,37 +144,22 @@ class genCode(commands.Cog):
         max_clicks: int = None,
         password: str = None,
     ) -> None:
-        await interaction.response.defer()
-
-        code, lang = generate_code_snippet(
-            language=language.value,
-            long_url=url,
-            alias=alias,
-            max_clicks=max_clicks,
-            password=password,
-        )
-
-        soft_errors: list[str] = []
+        with phase("defer"):
+            await interaction.response.defer()
 
-        if not validate_url(url):
-            url = url[:150] + "..." if len(url) > 150 else url
-            soft_errors.append(
-                f"- ```'{url}' is not a valid URL, the API might return an error```"
+        if language.value == ALL_LANGUAGES:
+            await self.send_code_archive(
+                interaction, url, alias=alias, max_clicks=max_clicks, password=password
             )
-        if alias is not None and not validate_string(alias):
-            alias = alias[:15] + "..." if len(alias) > 15 else alias
-            soft_errors.append(
-                f"- ```'{alias}' is not a valid alias, the API might return an error```"
-            )
-        if alias is not None and len(alias) > 15:
-            alias = alias[:15] + "..." if len(alias) > 15 else alias
-            soft_errors.append(
-                f"- ```'{alias}' is too long, the API will strip it to 15 characters```"
-            )
-        if password is not None and not validate_password(password):
-            password = password[:150] + "..." if len(password) > 150 else password
-            soft_errors.append(
-                f"- ```'{password}' is not a valid password, the API might return an error. Password must be atleast 8 characters long, must contain a letter and a number and a special character either '@' or '.' and cannot be consecutive```"
+            return
+
+        with phase("render"):
+            code, lang, soft_errors = render_code_response(
+                language=language.value,
+                url=url,
+                alias=alias,
+                password=password,
+                max_clicks=max_clicks,
             )
 
         if len(code) <= 4096:
@@ -117,7 +186,8 @@ class genCode(commands.Cog):
                     icon_url=interaction.user.default_avatar.url,
                 )
 
-            await interaction.followup.send(embed=embed)
+            with phase("followup"):
+                await interaction.followup.send(embed=embed)
 
         else:
             message: str = f"## {language.value} Code to use {config.urls.api_base}'s API \n```{lang}\n{code}```"
@@ -125,7 +195,52 @@ class genCode(commands.Cog):
             if soft_errors:
                 message += "\n\nSoft Warnings ⚠️\n" + "\n".join(soft_errors)
 
-            await interaction.followup.send(message)
+            with phase("followup"):
+                await interaction.followup.send(message)
+
+    async def send_code_archive(
+        self,
+        interaction: discord.Interaction,
+        url: str,
+        alias: str = None,
+        max_clicks: int = None,
+        password: str = None,
+    ) -> None:
+        with phase("render"):
+            archive, soft_errors = render_code_archive(
+                url=url, alias=alias, password=password, max_clicks=max_clicks
+            )
+
+        embed = discord.Embed(
+            title=f"Code in every language to Use {config.urls.api_base}'s API",
+            color=int(config.ui.colors.primary, 16),
+            description=f"```{len(available_languages)} snippets: {', '.join(available_languages)}```",
+            timestamp=interaction.created_at,
+        )
+
+        if soft_errors:
+            embed.add_field(
+                name="Soft Warnings", value="\n".join(soft_errors), inline=False
+            )
+
+        try:
+            embed.set_footer(
+                text=f"Requested by {interaction.user}",
+                icon_url=interaction.user.avatar.url,
+            )
+        except Exception:
+            embed.set_footer(
+                text=f"Requested by {interaction.user}",
+                icon_url=interaction.user.default_avatar.url,
+            )
+
+        with phase("followup"):
+            await interaction.followup.send(
+                embed=embed,
+                file=discord.File(
+                    io.BytesIO(archive), filename="spoo_me_code_snippets.zip"
+                ),
+            )
 
     @get_code.error
     async def get_code_error(
@@ -1,7 +1,8 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-from utils import shortener, generate_error_message, generate_command_error_embed
+from utils import generate_error_message, generate_command_error_embed
+from services import phase, spoo_client
 from schemas import BotEmojis, SocialShareUrls
 from config import config
 
@@ -81,9 +82,10 @@ class shortenUrl(commands.Cog):
         max_clicks: int = None,
         password: str = None,
     ) -> None:
-        await interaction.response.defer()
+        with phase("defer"):
+            await interaction.response.defer()
 
-        result = shortener.shorten(
+        result = await spoo_client.shorten(
             url, alias=alias, max_clicks=max_clicks, password=password
         )
 
@@ -113,7 +115,10 @@ class shortenUrl(commands.Cog):
             )
 
         short_code = result.split("/")[-1]
-        await interaction.followup.send(embed=embed, view=self.buttonView(short_code))
+        with phase("followup"):
+            await interaction.followup.send(
+                embed=embed, view=self.buttonView(short_code)
+            )
 
     @app_commands.command(
         name="emojify",
@@ -143,10 +148,11 @@ class shortenUrl(commands.Cog):
         max_clicks: int = None,
         password: str = None,
     ) -> None:
-        await interaction.response.defer()
+        with phase("defer"):
+            await interaction.response.defer()
 
-        result = shortener.emojify(
-            url, emoji_alias=emojies, max_clicks=max_clicks, password=password
+        result = await spoo_client.emojify(
+            url, emojies=emojies, max_clicks=max_clicks, password=password
         )
 
         embed = discord.Embed(
@@ -175,7 +181,10 @@ class shortenUrl(commands.Cog):
             )
 
         short_code: str = result.split("/")[-1]
-        await interaction.followup.send(embed=embed, view=self.buttonView(short_code))
+        with phase("followup"):
+            await interaction.followup.send(
+                embed=embed, view=self.buttonView(short_code)
+            )
 
     @shorten.error
     async def shorten_error(
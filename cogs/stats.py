@@ -1,23 +1,40 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
+import io
 import json
-import os
-from py_spoo_url import Statistics
+from concurrent.futures.process import BrokenProcessPool
 from utils import (
     generate_chart,
     generate_error_message,
     generate_command_error_embed,
-    generate_countries_heatmap,
+    set_chart_image,
+    timed_interaction,
 )
 from schemas import ChartColors
+from services import (
+    LinkStatistics,
+    RenderQueueFullError,
+    ServiceError,
+    export_engine,
+    heatmap_renderer,
+    phase,
+    statistics_service,
+)
 from config import config
 
+# Select option value -> (export file type, label shown in the embed, uploaded file name)
+EXPORT_OPTIONS: dict[str, tuple[str, str, str]] = {
+    "Export as JSON 🔑": ("json", "JSON", "json_export.json"),
+    "Export as CSV 📝": ("csv", "CSV", "csv_export.zip"),
+    "Export as Excel 📊": ("xlsx", "Excel", "excel_export.xlsx"),
+}
+
 
 class StatsSelectView(discord.ui.View):
-    def __init__(self, stats: Statistics) -> None:
+    def __init__(self, stats: LinkStatistics) -> None:
         super().__init__(timeout=None)
-        self.stats: Statistics = stats
+        self.stats: LinkStatistics = stats
         self.used_export_options = []
         self.used_charts_options = []
         self.chart_colors: ChartColors = config.ui.charts.colors
@@ -66,10 +83,12 @@ class StatsSelectView(discord.ui.View):
             ),
         ],
     )
+    @timed_interaction("stats charts")
     async def analysis_chart_callback(
         self, interaction: discord.Interaction, select: discord.ui.Select
     ) -> None:
         if select.values[0] in self.used_charts_options:
+            interaction.extras["timer"].outcome = "rejected"
             await interaction.response.send_message(
                 embed=discord.Embed(
                     title="An Error Occured",
@@ -80,7 +99,8 @@ class StatsSelectView(discord.ui.View):
             )
             return
 
-        await interaction.response.defer()
+        with phase("defer"):
+            await interaction.response.defer()
 
         # Create a common embed for all charts
         embed = discord.Embed(
@@ -104,7 +124,7 @@ class StatsSelectView(discord.ui.View):
             )
 
         if select.values[0] == "Platform Analysis 📱":
-            resp = generate_chart(
+            resp = await generate_chart(
                 data=[
                     self.stats.platforms_analysis,
                     self.stats.unique_platforms_analysis,
@@ -120,7 +140,7 @@ class StatsSelectView(discord.ui.View):
                 "This chart shows the trend of platforms used to access the URL"
             )
 
-            embed.set_image(url=resp["url"])
+            file = set_chart_image(embed, resp)
             embed.add_field(
                 name="Short Code", value=f"```{self.stats.short_code}```", inline=False
             )
@@ -140,7 +160,7 @@ class StatsSelectView(discord.ui.View):
             )
 
         elif select.values[0] == "Browser Analysis 🌐":
-            resp = generate_chart(
+            resp = await generate_chart(
                 data=[
                     self.stats.browsers_analysis,
                     self.stats.unique_browsers_analysis,
@@ -156,7 +176,7 @@ class StatsSelectView(discord.ui.View):
                 "This chart shows the trend of browsers used to access the URL"
             )
 
-            embed.set_image(url=resp["url"])
+            file = set_chart_image(embed, resp)
             embed.add_field(
                 name="Short Code", value=f"```{self.stats.short_code}```", inline=False
             )
@@ -176,7 +196,7 @@ class StatsSelectView(discord.ui.View):
             )
 
         elif select.values[0] == "Referrers Analysis 🔗":
-            resp = generate_chart(
+            resp = await generate_chart(
                 data=[
                     self.stats.referrers_analysis,
                     self.stats.unique_referrers_analysis,
@@ -192,7 +212,7 @@ class StatsSelectView(discord.ui.View):
                 "This chart shows the trend of referrers used to access the URL"
             )
 
-            embed.set_image(url=resp["url"])
+            file = set_chart_image(embed, resp)
             embed.add_field(
                 name="Short Code", value=f"```{self.stats.short_code}```", inline=False
             )
@@ -215,7 +235,7 @@ class StatsSelectView(discord.ui.View):
             click_data = self.stats.last_n_days_analysis(30)
             unique_click_data = self.stats.last_n_days_unique_analysis(30)
 
-            resp = generate_chart(
+            resp = await generate_chart(
                 data=[click_data, unique_click_data],
                 backgrounds=self.chart_colors.timeline,
                 labels=["Clicks", "Unique Clicks"],
@@ -228,7 +248,7 @@ class StatsSelectView(discord.ui.View):
                 "This chart shows the trend of clicks over the last 30 days"
             )
 
-            embed.set_image(url=resp["url"])
+            file = set_chart_image(embed, resp)
             embed.add_field(
                 name="Short Code", value=f"```{self.stats.short_code}```", inline=False
             )
@@ -248,17 +268,11 @@ class StatsSelectView(discord.ui.View):
             )
 
         elif select.values[0] == "Countries Heatmap 🔥":
-            heatmap_config = config.ui.charts.heatmap
-            map = generate_countries_heatmap(
-                data=self.stats.country_analysis, alpha=heatmap_config.alpha
-            )
-            map.savefig(
-                "heatmap.png",
-                format="png",
-                bbox_inches=heatmap_config.bbox_inches,
-                pad_inches=heatmap_config.pad_inches,
-                dpi=heatmap_config.dpi,
+            heatmap = await self._render_heatmap(
+                interaction, self.stats.country_analysis, title="Countries Heatmap"
             )
+            if heatmap is None:
+                return
 
             embed.title = "Countries Heatmap 🔥"
             embed.description = (
@@ -278,22 +292,16 @@ class StatsSelectView(discord.ui.View):
                 inline=False,
             )
 
-            file = discord.File("heatmap.png", filename="heatmap.png")
+            file = discord.File(heatmap, filename="heatmap.png")
 
         elif select.values[0] == "Unique Countries Heatmap 🌍":
-            heatmap_config = config.ui.charts.heatmap
-            map = generate_countries_heatmap(
-                data=self.stats.unique_country_analysis,
-                alpha=heatmap_config.alpha,
+            heatmap = await self._render_heatmap(
+                interaction,
+                self.stats.unique_country_analysis,
                 title="Unique Countries Heatmap",
             )
-            map.savefig(
-                "unique_heatmap.png",
-                format="png",
-                bbox_inches=heatmap_config.bbox_inches,
-                pad_inches=heatmap_config.pad_inches,
-                dpi=heatmap_config.dpi,
-            )
+            if heatmap is None:
+                return
 
             embed.title = "Unique Countries Heatmap 🌍"
             embed.description = "This heatmap shows the unique clicks countries where the URL was accessed"
@@ -311,12 +319,13 @@ class StatsSelectView(discord.ui.View):
                 inline=False,
             )
 
-            file = discord.File("unique_heatmap.png", filename="unique_heatmap.png")
+            file = discord.File(heatmap, filename="unique_heatmap.png")
 
-        if file is not None:
-            await interaction.followup.send(embed=embed, file=file)
-        else:
-            await interaction.followup.send(embed=embed)
+        with phase("followup"):
+            if file is not None:
+                await interaction.followup.send(embed=embed, file=file)
+            else:
+                await interaction.followup.send(embed=embed)
 
         self.used_charts_options.append(select.values[0])
         if len(self.used_charts_options) == 6:
@@ -325,6 +334,35 @@ class StatsSelectView(discord.ui.View):
             self.used_charts_options = []
         return
 
+    async def _render_heatmap(
+        self, interaction: discord.Interaction, data: dict, title: str
+    ) -> io.BytesIO | None:
+        """Render a heatmap, or report the failure to the user and return ``None``."""
+        try:
+            return await heatmap_renderer.render(data, title=title)
+        except (ServiceError, BrokenProcessPool) as e:
+            await self._send_render_error(interaction, e)
+        except Exception as e:
+            # Raised by the render itself, inside the worker
+            print(f"Error rendering heatmap: {e}")
+            await self._send_render_error(interaction, e)
+        return None
+
+    async def _send_render_error(
+        self, interaction: discord.Interaction, error: Exception
+    ) -> None:
+        interaction.extras["timer"].outcome = (
+            "render_busy" if isinstance(error, RenderQueueFullError) else "render_error"
+        )
+        await interaction.followup.send(
+            embed=discord.Embed(
+                title="An Error Occured",
+                description=f"```{error}```",
+                color=int(config.ui.colors.error, 16),
+            ),
+            ephemeral=True,
+        )
+
     @discord.ui.select(
         placeholder="📥 Export Statistics Data",
         min_values=1,
@@ -350,10 +388,12 @@ class StatsSelectView(discord.ui.View):
             ),
         ],
     )
+    @timed_interaction("stats export")
     async def export_data_callback(
         self, interaction: discord.Interaction, select: discord.ui.Select
     ) -> None:
         if select.values[0] in self.used_export_options:
+            interaction.extras["timer"].outcome = "rejected"
             await interaction.response.send_message(
                 embed=discord.Embed(
                     title="An Error Occured",
@@ -364,7 +404,8 @@ class StatsSelectView(discord.ui.View):
             )
             return
 
-        await interaction.response.defer()
+        with phase("defer"):
+            await interaction.response.defer()
 
         try:
             embed = discord.Embed(
@@ -375,43 +416,17 @@ class StatsSelectView(discord.ui.View):
                 url=f"{self.base_url}/stats/{self.stats.short_code}",
             )
 
-            if select.values[0] == "Export as JSON 🔑":
-                self.stats.export_data(filename="json_export.json", filetype="json")
-                file_size: float = round(os.path.getsize("json_export.json") / 1024, 2)
-                embed.add_field(
-                    name="File Information",
-                    value=f"```Size: {file_size} KB\nType: JSON```",
-                    inline=False,
-                )
-                file = discord.File(
-                    "json_export.json",
-                    filename=f"{self.stats.short_code}_json_export.json",
-                )
-
-            elif select.values[0] == "Export as CSV 📝":
-                self.stats.export_data(filename="csv_export", filetype="csv")
-                file_size: float = round(os.path.getsize("csv_export.zip") / 1024, 2)
-                embed.add_field(
-                    name="File Information",
-                    value=f"```Size: {file_size} KB\nType: CSV```",
-                    inline=False,
-                )
-                file = discord.File(
-                    "csv_export.zip", filename=f"{self.stats.short_code}_csv_export.zip"
-                )
-
-            elif select.values[0] == "Export as Excel 📊":
-                self.stats.export_data(filename="excel_export.xlsx", filetype="xlsx")
-                file_size = round(os.path.getsize("excel_export.xlsx") / 1024, 2)
-                embed.add_field(
-                    name="File Information",
-                    value=f"```Size: {file_size} KB\nType: Excel```",
-                    inline=False,
-                )
-                file = discord.File(
-                    "excel_export.xlsx",
-                    filename=f"{self.stats.short_code}_excel_export.xlsx",
-                )
+            filetype, label, filename = EXPORT_OPTIONS[select.values[0]]
+            export = await export_engine.export(self.stats.data, filetype)
+            file_size: float = round(export.size / 1024, 2)
+            embed.add_field(
+                name="File Information",
+                value=f"```Size: {file_size} KB\nType: {label}```",
+                inline=False,
+            )
+            file = discord.File(
+                export.file, filename=f"{self.stats.short_code}_{filename}"
+            )
 
             try:
                 embed.set_footer(
@@ -424,15 +439,8 @@ class StatsSelectView(discord.ui.View):
                     icon_url=interaction.user.default_avatar,
                 )
 
-            await interaction.followup.send(embed=embed, file=file)
-
-            # Cleanup exported files
-            if select.values[0] == "Export as JSON 🔑":
-                os.remove("json_export.json")
-            elif select.values[0] == "Export as CSV 📝":
-                os.remove("csv_export.zip")
-            elif select.values[0] == "Export as Excel 📊":
-                os.remove("excel_export.xlsx")
+            with phase("followup"):
+                await interaction.followup.send(embed=embed, file=file)
 
             self.used_export_options.append(select.values[0])
             if len(self.used_export_options) == 3:
@@ -443,6 +451,7 @@ class StatsSelectView(discord.ui.View):
             return
 
         except Exception as e:
+            interaction.extras["timer"].outcome = "error"
             await interaction.followup.send(
                 embed=discord.Embed(
                     title="An Error Occured",
@@ -473,15 +482,16 @@ class urlStats(commands.Cog):
     async def stats(
         self, interaction: discord.Interaction, short_code: str, password: str = None
     ) -> None:
-        await interaction.response.send_message(
-            embed=discord.Embed(
-                description="Fetching statistics...",
-                color=int(config.ui.colors.primary, 16),
-            ),
-            ephemeral=True,
-        )
+        with phase("defer"):
+            await interaction.response.send_message(
+                embed=discord.Embed(
+                    description="Fetching statistics...",
+                    color=int(config.ui.colors.primary, 16),
+                ),
+                ephemeral=True,
+            )
 
-        result = Statistics(short_code, password=password)
+        result = await statistics_service.get(short_code, password=password)
 
         embed = discord.Embed(
             title="URL Statistics 📊",
@@ -515,6 +525,12 @@ class urlStats(commands.Cog):
             value=f"```Daily - {result.average_daily_clicks}```\n```Weekly - {result.average_weekly_clicks}```\n```Monthly - {result.average_monthly_clicks}```",
             inline=True,
         )
+        if result.stale:
+            embed.add_field(
+                name="Cached Statistics ⚠️",
+                value=f"spoo.me is not responding, these statistics are from <t:{int(result.fetched_at)}:R>.",
+                inline=False,
+            )
 
         try:
             embed.set_footer(
@@ -527,7 +543,7 @@ class urlStats(commands.Cog):
                 icon_url=interaction.user.default_avatar,
             )
 
-        resp = generate_chart(
+        resp = await generate_chart(
             data=[
                 result.last_n_days_analysis(7),
                 result.last_n_days_unique_analysis(7),
@@ -537,13 +553,19 @@ class urlStats(commands.Cog):
             title="Clicks Over Time Chart",
             type="line",
         )
-        embed.set_image(url=resp["url"])
+        file = set_chart_image(embed, resp)
 
         if result.password:
             embed.add_field(name="Password", value=f"```{password}```", inline=False)
-            await interaction.user.send(embed=embed, view=StatsSelectView(result))
+            with phase("followup"):
+                await interaction.user.send(
+                    embed=embed, file=file, view=StatsSelectView(result)
+                )
         else:
-            await interaction.channel.send(embed=embed, view=StatsSelectView(result))
+            with phase("followup"):
+                await interaction.channel.send(
+                    embed=embed, file=file, view=StatsSelectView(result)
+                )
 
         return
 
@@ -25,6 +25,14 @@ from schemas.models import (
     Urls,
     UI,
     Server,
+    Http,
+    Resilience,
+    Render,
+    Cache,
+    Exports,
+    Metrics,
+    Gateway,
+    Cluster,
     Assets,
     Command,
     Cooldowns,
@@ -43,6 +51,14 @@ class Config(BaseConfigModel):
     urls: Urls
     ui: UI
     server: Server
+    http: Http
+    resilience: Resilience
+    render: Render
+    cache: Cache
+    exports: Exports
+    metrics: Metrics
+    gateway: Gateway
+    cluster: Cluster
     assets: Assets
     commands: Dict[str, Command]
     cooldowns: Cooldowns
@@ -1,42 +1,146 @@
 import datetime
 import os
 import random
-import statistics
 import sys
 import time
 from discord.app_commands.models import AppCommand
 from discord.ext import commands, tasks
 import discord
+from discord import app_commands
 from config import config
+from schemas import Gateway
 from api import keep_alive
 from utils import welcome_gifs, commands_, fetch_spoo_stats
+from services import (
+    LatencyHistogram,
+    close_session,
+    command_metrics,
+    gateway_metrics,
+    heatmap_renderer,
+    cluster_reporter,
+    cluster_statuses,
+    current_cluster,
+    loop_monitor,
+    shard_states,
+    start_deadline,
+    start_timer,
+)
 
 start_time = None
-latencies = []
 
 
-class spooBot(commands.Bot):
+def latency_summary(histogram: LatencyHistogram) -> str:
+    p50, p95, p99 = histogram.percentiles(50, 95, 99)
+    return f"p50 {p50:.0f} ms | p95 {p95:.0f} ms | p99 {p99:.0f} ms"
+
+
+def gateway_intents(profile: str) -> discord.Intents:
+    if profile == "all":
+        return discord.Intents.all()
+
+    # Everything the bot reads: guild/channel lookups, prefix commands and
+    # mentions in guilds and DMs, and member joins for the welcome message
+    return discord.Intents(
+        guilds=True,
+        guild_messages=True,
+        dm_messages=True,
+        message_content=True,
+        members=True,
+    )
+
+
+def gateway_options(gateway: Gateway = config.gateway) -> dict:
+    """Client options for the configured intents profile and member cache policy."""
+    intents = gateway_intents(gateway.intents)
+
+    if gateway.member_cache == "none":
+        member_cache_flags = discord.MemberCacheFlags.none()
+    elif gateway.member_cache == "joined":
+        member_cache_flags = discord.MemberCacheFlags(joined=True)
+    else:
+        member_cache_flags = discord.MemberCacheFlags.from_intents(intents)
+
+    options = {
+        "intents": intents,
+        "member_cache_flags": member_cache_flags,
+        "chunk_guilds_at_startup": gateway.chunk_guilds_at_startup,
+        "max_messages": gateway.max_messages or None,
+    }
+    if current_cluster is not None:
+        # Launched by cluster.py: run only the shards assigned to this process
+        options["shard_ids"] = current_cluster.shard_ids
+        options["shard_count"] = current_cluster.shard_count
+    elif gateway.sharded:
+        options["shard_count"] = gateway.shard_count or None
+    return options
+
+
+def member_count(client: discord.Client) -> int:
+    """Members across all guilds, as reported by Discord rather than cached."""
+    return sum(guild.member_count or 0 for guild in client.guilds)
+
+
+class spooCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Runs right before every app command, hybrid ones included, in the
+        # same task, so services can attribute their phases to this timer and
+        # stop their upstream calls once the interaction has expired
+        interaction.extras["timer"] = start_timer()
+        start_deadline(interaction)
+        return True
+
+    async def on_error(
+        self, interaction: discord.Interaction, error: app_commands.AppCommandError
+    ) -> None:
+        timer = interaction.extras.get("timer")
+        if timer is not None and interaction.command is not None:
+            if isinstance(error, app_commands.CommandOnCooldown):
+                timer.outcome = "cooldown"
+            else:
+                timer.outcome = "error"
+            command_metrics.record_timer(interaction.command.qualified_name, timer)
+
+        await super().on_error(interaction, error)
+
+
+# One gateway connection per shard, all on this process's event loop
+BotBase = (
+    commands.AutoShardedBot
+    if config.gateway.sharded or current_cluster is not None
+    else commands.Bot
+)
+
+
+class spooBot(BotBase):
     def __init__(self):
         super().__init__(
             command_prefix=config.bot.command_prefix,
-            intents=discord.Intents.all(),
             help_command=None,
+            tree_cls=spooCommandTree,
+            **gateway_options(),
         )
         self.synced = False
+        self.keep_alive = None  # aiohttp runner of the health/metrics server
         self.stats_channel_1 = None  # Will store channel object for total clicks
         self.stats_channel_2 = None  # Will store channel object for total shortlinks
 
+        self.before_invoke(before_invoke)
+        for command in (sync, loop_lag, ping, help, invite, stats, support, about):
+            self.add_command(command)
+
     async def on_ready(self):
-        await load()
+        await load(self)
 
         global start_time
         start_time = datetime.datetime.now(datetime.UTC)
 
         await self.wait_until_ready()
         if not self.synced:
-            await self.tree.sync()
+            # Commands are global, so one cluster syncing them is enough
+            if current_cluster is None or current_cluster.cluster_id == 0:
+                await self.tree.sync()
             try:
-                await bot.change_presence(
+                await self.change_presence(
                     activity=discord.CustomActivity(
                         name="Custom Status",
                         state=config.bot.custom_status,
@@ -53,6 +157,96 @@ class spooBot(commands.Bot):
         print(f"Logged in as {self.user.name} (ID: {self.user.id})")
         print(f"Connected to {len(self.guilds)} guilds")
 
+    # Sharded clients report gateway events per shard; plain ones as shard 0
+    async def on_shard_connect(self, shard_id: int) -> None:
+        gateway_metrics.connects[shard_id] += 1
+
+    async def on_shard_disconnect(self, shard_id: int) -> None:
+        gateway_metrics.disconnects[shard_id] += 1
+
+    async def on_shard_resumed(self, shard_id: int) -> None:
+        gateway_metrics.resumes[shard_id] += 1
+
+    async def on_connect(self) -> None:
+        if not isinstance(self, commands.AutoShardedBot):
+            gateway_metrics.connects[0] += 1
+
+    async def on_disconnect(self) -> None:
+        if not isinstance(self, commands.AutoShardedBot):
+            gateway_metrics.disconnects[0] += 1
+
+    async def on_resumed(self) -> None:
+        if not isinstance(self, commands.AutoShardedBot):
+            gateway_metrics.resumes[0] += 1
+
+    async def on_message(self, message) -> None:
+        if message.author == self.user:
+            return
+
+        if (
+            self.user in message.mentions
+            and message.type is not discord.MessageType.reply
+        ):
+            embed = discord.Embed(
+                description=config.ui.messages.bot_mention.format(
+                    help_cmd_id=config.commands["help"].id
+                ),
+                color=int(config.ui.colors.primary, 16),
+            )
+            await message.reply(embed=embed)
+
+        await self.process_commands(message)
+
+    async def on_member_join(self, member):
+        channel = self.get_channel(int(config.discord.ids.channels.welcome))
+
+        embed = discord.Embed(
+            title="Welcome to the spoo.me Support Server!",
+            description=config.ui.messages.welcome.format(mention=member.mention),
+            color=int(config.ui.colors.primary, 16),
+            url=config.urls.api_base,
+        )
+
+        embed.set_image(url=random.choice(welcome_gifs))
+
+        try:
+            embed.set_thumbnail(url=member.avatar.url)
+        except Exception:
+            embed.set_thumbnail(url=member.default_avatar.url)
+
+        await channel.send(embed=embed)
+
+    async def on_command_completion(self, ctx) -> None:
+        # Slash invocations of hybrid commands are recorded with the app commands
+        if ctx.interaction is not None:
+            return
+
+        end: float = time.perf_counter()
+        latency = (end - ctx.start) * 1000
+        command_metrics.record(ctx.command.qualified_name, latency)
+
+    async def on_app_command_completion(
+        self, interaction: discord.Interaction, command: app_commands.Command
+    ) -> None:
+        timer = interaction.extras.get("timer")
+        if timer is not None:
+            command_metrics.record_timer(command.qualified_name, timer)
+
+    async def setup_hook(self) -> None:
+        await heatmap_renderer.start()
+        loop_monitor.start()
+        cluster_reporter.start(self)
+        self.keep_alive = await keep_alive(self)
+
+    async def close(self) -> None:
+        if self.keep_alive is not None:
+            await self.keep_alive.cleanup()
+        await cluster_reporter.stop()
+        loop_monitor.stop()
+        heatmap_renderer.shutdown()
+        await close_session()
+        await super().close()
+
     @tasks.loop(minutes=10)
     async def update_stats(self):
         """Update channel names with current statistics"""
@@ -68,7 +262,7 @@ class spooBot(commands.Bot):
                 )
 
         if self.stats_channel_1 and self.stats_channel_2:
-            stats = await fetch_spoo_stats()
+            stats = await fetch_spoo_stats(fresh=True)
             if stats:
                 try:
                     await self.stats_channel_1.edit(
@@ -81,81 +275,65 @@ class spooBot(commands.Bot):
                     print(f"Error updating channel names: {e}", file=sys.stdout)
 
 
-bot = spooBot()
-
-
-async def load() -> None:
+async def load(bot: commands.Bot) -> None:
     for f in os.listdir("cogs"):
         if f.endswith(".py"):
             await bot.load_extension(f"cogs.{f[:-3]}")
 
 
-@bot.event
-async def on_message(message) -> None:
-    if message.author == bot.user:
-        return
-
-    if bot.user in message.mentions and message.type is not discord.MessageType.reply:
-        embed = discord.Embed(
-            description=config.ui.messages.bot_mention.format(
-                help_cmd_id=config.commands["help"].id
-            ),
-            color=int(config.ui.colors.primary, 16),
-        )
-        await message.reply(embed=embed)
-
-    await bot.process_commands(message)
-
-
-@bot.event
-async def on_member_join(member):
-    channel = bot.get_channel(int(config.discord.ids.channels.welcome))
-
-    embed = discord.Embed(
-        title="Welcome to the spoo.me Support Server!",
-        description=config.ui.messages.welcome.format(mention=member.mention),
-        color=int(config.ui.colors.primary, 16),
-        url=config.urls.api_base,
-    )
-
-    embed.set_image(url=random.choice(welcome_gifs))
-
-    try:
-        embed.set_thumbnail(url=member.avatar.url)
-    except Exception:
-        embed.set_thumbnail(url=member.default_avatar.url)
-
-    await channel.send(embed=embed)
+async def before_invoke(ctx) -> None:
+    start = time.perf_counter()
+    ctx.start = start
 
 
-@bot.command()
+@commands.command()
 @commands.is_owner()
 async def sync(ctx) -> None:
-    await bot.tree.sync()
-    synced: tasks.List[AppCommand] = await bot.tree.sync()
+    await ctx.bot.tree.sync()
+    synced: tasks.List[AppCommand] = await ctx.bot.tree.sync()
     if len(synced) > 0:
         await ctx.send(f"Successfully Synced {len(synced)} Commands ✔️")
     else:
         await ctx.send("No Slash Commands to Sync :/")
 
 
-@bot.event
-async def on_command_completion(ctx) -> None:
-    end: float = time.perf_counter()
-    start = ctx.start
-    latency = (end - start) * 1000
-    latencies.append(latency)
-    if len(latencies) > 10:
-        latencies.pop(0)
+@commands.command(name="loop-lag")
+@commands.is_owner()
+async def loop_lag(ctx) -> None:
+    embed = discord.Embed(
+        title="Event Loop Lag",
+        color=int(config.ui.colors.primary, 16),
+        timestamp=ctx.message.created_at,
+    )
+    embed.add_field(
+        name="Lag",
+        value=f"```{latency_summary(loop_monitor.histogram)}```",
+        inline=False,
+    )
+    embed.add_field(
+        name="Latest", value=f"```{loop_monitor.lag * 1000:.1f} ms```", inline=True
+    )
+    embed.add_field(
+        name="Worst", value=f"```{loop_monitor.max_lag * 1000:.1f} ms```", inline=True
+    )
+    embed.add_field(
+        name="Stalls", value=f"```{loop_monitor.stall_count}```", inline=True
+    )
 
+    if loop_monitor.stalls:
+        stall = loop_monitor.stalls[-1]
+        # Innermost frames are the ones that blocked; keep them within the field limit
+        stack = stall.stack[-(1024 - 80) :]
+        embed.add_field(
+            name=f"Last Stall ({stall.blocked_for * 1000:.0f} ms, <t:{int(stall.at.timestamp())}:R>)",
+            value=f"```py\n{stack}```",
+            inline=False,
+        )
 
-@bot.before_invoke
-async def before_invoke(ctx) -> None:
-    start = time.perf_counter()
-    ctx.start = start
+    await ctx.send(embed=embed)
 
 
-@bot.command()
+@commands.command()
 async def ping(ctx) -> None:
     try:
         embed = discord.Embed(title="Pong!", color=int(config.ui.colors.success, 16))
@@ -165,14 +343,20 @@ async def ping(ctx) -> None:
         latency = (end - ctx.start) * 1000
 
         embed.add_field(
-            name="Latency", value=f"{bot.latency * 1000:.2f} ms", inline=False
+            name="Latency", value=f"{ctx.bot.latency * 1000:.2f} ms", inline=False
         )
         embed.add_field(name="Message Latency", value=f"{latency:.2f} ms", inline=False)
 
-        if latencies:
-            average_ping = statistics.mean(latencies)
+        if command_metrics.overall.count:
+            embed.add_field(
+                name="Command Latency",
+                value=latency_summary(command_metrics.overall),
+                inline=False,
+            )
             embed.add_field(
-                name="Average Ping", value=f"{average_ping:.2f} ms", inline=False
+                name="Throughput",
+                value=f"{command_metrics.overall.throughput():.1f} commands/min",
+                inline=False,
             )
 
         global start_time
@@ -198,12 +382,12 @@ async def ping(ctx) -> None:
         print(e, file=sys.stdout)
 
 
-@bot.hybrid_command(
+@commands.hybrid_command(
     name="help",
     description=f"{config.commands['help'].description} {config.commands['help'].emoji}",
 )
 async def help(ctx) -> None:
-    user: discord.User | None = bot.get_user(int(config.bot.bot_id))
+    user: discord.User | None = ctx.bot.get_user(int(config.bot.bot_id))
     profilePicture: str = user.avatar.url
 
     embed = discord.Embed(
@@ -231,7 +415,7 @@ async def help(ctx) -> None:
     await ctx.send(embed=embed)
 
 
-@bot.hybrid_command(
+@commands.hybrid_command(
     name="invite",
     description="Get the invite link for the bot 💌",
 )
@@ -257,7 +441,7 @@ async def invite(ctx) -> None:
     await ctx.send(embed=embed)
 
 
-@bot.hybrid_command(
+@commands.hybrid_command(
     name="bot-stats",
     description=f"{config.commands['bot_stats'].description} {config.commands['bot_stats'].emoji}",
 )
@@ -276,8 +460,8 @@ async def stats(ctx) -> None:
         timestamp=ctx.message.created_at,
     )
 
-    embed.add_field(name="Servers", value=f"```{len(bot.guilds)}```", inline=True)
-    embed.add_field(name="Users", value=f"```{len(bot.users)}```", inline=True)
+    embed.add_field(name="Servers", value=f"```{len(ctx.bot.guilds)}```", inline=True)
+    embed.add_field(name="Users", value=f"```{member_count(ctx.bot)}```", inline=True)
     embed.add_field(
         name="Uptime",
         value=f"```{hours} hours {minutes} minutes {seconds} seconds```",
@@ -288,6 +472,91 @@ async def stats(ctx) -> None:
     )
     embed.add_field(name="Total Commands", value=f"```{len(commands_)}```", inline=True)
 
+    shards = shard_states(ctx.bot)
+    shard_lines = [
+        f"#{shard.shard_id}: {shard.latency * 1000:.0f} ms | {shard.guilds} guilds | "
+        f"{shard.disconnects} reconnects"
+        + ("" if shard.connected else " | disconnected")
+        for shard in shards[:15]
+    ]
+    if len(shards) > 15:
+        shard_lines.append(f"... and {len(shards) - 15} more")
+    embed.add_field(
+        name=f"Shards ({len(shards)})",
+        value="```" + "\n".join(shard_lines) + "```",
+        inline=False,
+    )
+
+    if current_cluster is not None:
+        clusters = await cluster_statuses()
+        embed.add_field(
+            name=f"Clusters ({len(clusters)})",
+            value="```"
+            + "\n".join(
+                f"#{status['cluster_id']}: shards {status['shard_ids'][0]}-"
+                f"{status['shard_ids'][-1]} | {status['guilds']} guilds"
+                + ("" if status["ready"] else " | starting")
+                for status in clusters
+            )
+            + f"\nTotal: {sum(status['guilds'] for status in clusters)} guilds, "
+            f"{sum(status['members'] for status in clusters)} users```",
+            inline=False,
+        )
+
+    if command_metrics.overall.count:
+        embed.add_field(
+            name="Command Latency",
+            value=f"```{latency_summary(command_metrics.overall)}```",
+            inline=False,
+        )
+        embed.add_field(
+            name="Throughput",
+            value=f"```{command_metrics.overall.throughput():.1f} commands/min```",
+            inline=True,
+        )
+        embed.add_field(
+            name="Commands Served",
+            value=f"```{command_metrics.overall.count}```",
+            inline=True,
+        )
+
+        # The commands with the worst tail latency
+        slowest = sorted(
+            command_metrics.commands.items(),
+            key=lambda item: item[1].percentiles(95)[0],
+            reverse=True,
+        )[:5]
+        embed.add_field(
+            name="Slowest Commands",
+            value="```"
+            + "\n".join(
+                f"{name}: {latency_summary(histogram)}" for name, histogram in slowest
+            )
+            + "```",
+            inline=False,
+        )
+
+        slowest_phases = sorted(
+            (
+                (key, histogram)
+                for key, histogram in command_metrics.phases.items()
+                if key[1] == "success"
+            ),
+            key=lambda item: item[1].percentiles(95)[0],
+            reverse=True,
+        )[:5]
+        if slowest_phases:
+            embed.add_field(
+                name="Slowest Phases (p95)",
+                value="```"
+                + "\n".join(
+                    f"{command} / {name}: {histogram.percentiles(95)[0]:.0f} ms"
+                    for (command, _, name), histogram in slowest_phases
+                )
+                + "```",
+                inline=False,
+            )
+
     try:
         embed.set_footer(
             text=f"Information requested by: {ctx.author.name}",
@@ -302,7 +571,7 @@ async def stats(ctx) -> None:
     await ctx.send(embed=embed)
 
 
-@bot.hybrid_command(
+@commands.hybrid_command(
     name="support",
     description="Join the Support Server of the bot 🛠️",
 )
@@ -328,7 +597,7 @@ async def support(ctx) -> None:
     await ctx.send(embed=embed)
 
 
-@bot.hybrid_command(
+@commands.hybrid_command(
     name="about",
     description="View information about the bot 🤖",
 )
@@ -370,7 +639,7 @@ async def about(ctx) -> None:
             inline=True,
         )
 
-    user: discord.User | None = bot.get_user(int(config.bot.bot_id))
+    user: discord.User | None = ctx.bot.get_user(int(config.bot.bot_id))
     embed.set_thumbnail(url=user.avatar.url)
 
     try:
@@ -405,11 +674,10 @@ async def about(ctx) -> None:
     await ctx.send(embed=embed, view=view)
 
 
-if __name__ == "__main__":
-    if (
-        config.server.environment != "development"
-        and config.server.is_cloud_hosted
-        and config.server.keep_alive.enabled
-    ):
-        keep_alive()
+def main() -> None:
+    bot = spooBot()
     bot.run(token=config.bot.bot_token)
+
+
+if __name__ == "__main__":
+    main()
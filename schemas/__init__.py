@@ -34,6 +34,18 @@ from schemas.models import (
     UIMessages,
     Server,
     KeepAlive,
+    Http,
+    Render,
+    Cache,
+    CacheSettings,
+    ChartCacheSettings,
+    RevalidatingCacheSettings,
+    StatsCacheSettings,
+    Exports,
+    Metrics,
+    Resilience,
+    Gateway,
+    Cluster,
     Charts,
     ChartColors,
     ChartStyle,
@@ -77,6 +89,18 @@ __all__: list[str] = [
     "UIMessages",
     "Server",
     "KeepAlive",
+    "Http",
+    "Render",
+    "Cache",
+    "CacheSettings",
+    "ChartCacheSettings",
+    "RevalidatingCacheSettings",
+    "StatsCacheSettings",
+    "Exports",
+    "Metrics",
+    "Resilience",
+    "Gateway",
+    "Cluster",
     "Charts",
     "ChartColors",
     "ChartStyle",
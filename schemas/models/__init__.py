@@ -18,6 +18,36 @@ from schemas.models.ui import UI, UIColors, UIMessages
 # Server related models
 from schemas.models.server import Server, KeepAlive
 
+# HTTP client related models
+from schemas.models.http import Http
+
+# Render pool related models
+from schemas.models.render import Render
+
+# Cache related models
+from schemas.models.cache import (
+    Cache,
+    CacheSettings,
+    ChartCacheSettings,
+    RevalidatingCacheSettings,
+    StatsCacheSettings,
+)
+
+# Export related models
+from schemas.models.exports import Exports
+
+# Metrics related models
+from schemas.models.metrics import Metrics
+
+# Resilience related models
+from schemas.models.resilience import Resilience
+
+# Gateway related models
+from schemas.models.gateway import Gateway
+
+# Cluster related models
+from schemas.models.cluster import Cluster
+
 # Chart related models
 from schemas.models.charts import (
     Charts,
@@ -60,6 +90,26 @@ __all__: list[str] = [
     # Server related
     "Server",
     "KeepAlive",
+    # HTTP client related
+    "Http",
+    # Render pool related
+    "Render",
+    # Cache related
+    "Cache",
+    "CacheSettings",
+    "ChartCacheSettings",
+    "RevalidatingCacheSettings",
+    "StatsCacheSettings",
+    # Export related
+    "Exports",
+    # Metrics related
+    "Metrics",
+    # Resilience related
+    "Resilience",
+    # Gateway related
+    "Gateway",
+    # Cluster related
+    "Cluster",
     # Chart related
     "Charts",
     "ChartColors",
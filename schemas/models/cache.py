@@ -0,0 +1,59 @@
+"""In-memory cache configuration schemas."""
+
+from typing import Annotated
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class CacheSettings(BaseConfigModel):
+    """Size and expiry settings for a single cache."""
+
+    ttl: Annotated[
+        float, RangeField(gt=0, le=604800, description="Entry time-to-live in seconds")
+    ]
+    max_size: Annotated[
+        int, RangeField(gt=0, le=100000, description="Maximum number of entries")
+    ]
+
+
+class ChartCacheSettings(CacheSettings):
+    """Chart cache settings with an optional on-disk tier."""
+
+    sqlite_path: str  # Empty string keeps the cache in memory only
+
+
+class RevalidatingCacheSettings(BaseConfigModel):
+    """Expiry settings for a value served stale while it is refreshed."""
+
+    ttl: Annotated[
+        float, RangeField(gt=0, le=86400, description="Seconds a value stays fresh")
+    ]
+    max_stale: Annotated[
+        float,
+        RangeField(
+            gt=0, le=604800, description="Seconds a stale value may still be served"
+        ),
+    ]
+
+
+class StatsCacheSettings(CacheSettings):
+    """Statistics cache settings with a fallback for when spoo.me is down."""
+
+    max_stale: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=604800,
+            description="Seconds expired statistics may be served while spoo.me fails",
+        ),
+    ]
+
+
+class Cache(BaseConfigModel):
+    """Cache configuration for the different cached resources."""
+
+    stats: StatsCacheSettings
+    charts: ChartCacheSettings
+    code: CacheSettings
+    metrics: RevalidatingCacheSettings
@@ -97,6 +97,17 @@ class ChartHeatmap(BaseConfigModel):
         str,
         Field(pattern=r"^(tight|standard)$", description="Heatmap bounding box mode"),
     ]
+    render_mode: Annotated[
+        str,
+        Field(
+            pattern=r"^(basemap|full)$",
+            description="Composite onto a cached basemap or redraw every layer",
+        ),
+    ]
+    compress_level: Annotated[
+        int,
+        RangeField(ge=0, le=9, description="PNG zlib compression level (0 = fastest)"),
+    ]
 
 
 # Subclass for UI configuration
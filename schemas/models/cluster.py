@@ -0,0 +1,54 @@
+"""Multi-process cluster configuration schemas."""
+
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class Cluster(BaseConfigModel):
+    """Cluster launcher, supervisor and shared state settings."""
+
+    clusters: Annotated[
+        int, RangeField(gt=0, le=256, description="Bot processes started by cluster.py")
+    ]
+    shard_count: Annotated[
+        int,
+        RangeField(
+            ge=0,
+            le=4096,
+            description="Shards across all clusters; 0 uses Discord's recommendation",
+        ),
+    ]
+    state_backend: Annotated[
+        str,
+        Field(
+            pattern=r"^(memory|sqlite)$",
+            description="Where clusters share state: this process only, or an SQLite file",
+        ),
+    ]
+    state_path: str
+    status_interval: Annotated[
+        float,
+        RangeField(gt=0, le=3600, description="Seconds between cluster status updates"),
+    ]
+    heartbeat_timeout: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=86400,
+            description="Seconds without a status update before a cluster is restarted",
+        ),
+    ]
+    restart_delay: Annotated[
+        float,
+        RangeField(
+            gt=0, le=3600, description="Initial delay before restarting a cluster"
+        ),
+    ]
+    max_restart_delay: Annotated[
+        float,
+        RangeField(gt=0, le=86400, description="Cap of the doubling restart delay"),
+    ]
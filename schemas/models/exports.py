@@ -0,0 +1,19 @@
+"""Statistics export configuration schemas."""
+
+from typing import Annotated
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class Exports(BaseConfigModel):
+    """In-memory export settings."""
+
+    spool_threshold: Annotated[
+        int,
+        RangeField(
+            gt=0,
+            le=104857600,
+            description="Bytes kept in memory before an export spills to a temp file",
+        ),
+    ]
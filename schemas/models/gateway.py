@@ -0,0 +1,39 @@
+"""Discord gateway configuration schemas."""
+
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class Gateway(BaseConfigModel):
+    """Gateway intents and client-side caching."""
+
+    intents: Annotated[
+        str,
+        Field(
+            pattern=r"^(minimal|all)$",
+            description="Intents profile: only what the bot uses, or every intent",
+        ),
+    ]
+    member_cache: Annotated[
+        str,
+        Field(
+            pattern=r"^(none|joined|intents)$",
+            description="Which members to keep cached",
+        ),
+    ]
+    chunk_guilds_at_startup: bool
+    sharded: bool
+    shard_count: Annotated[
+        int,
+        RangeField(
+            ge=0, le=1024, description="Shards to run; 0 uses Discord's recommendation"
+        ),
+    ]
+    max_messages: Annotated[
+        int,
+        RangeField(ge=0, le=100000, description="Messages cached; 0 disables"),
+    ]
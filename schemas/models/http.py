@@ -0,0 +1,30 @@
+"""HTTP client configuration schemas."""
+
+from typing import Annotated
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class Http(BaseConfigModel):
+    """Shared HTTP client configuration."""
+
+    total_timeout: Annotated[
+        float, RangeField(gt=0, le=300, description="Total request timeout in seconds")
+    ]
+    connect_timeout: Annotated[
+        float, RangeField(gt=0, le=60, description="Connection timeout in seconds")
+    ]
+    pool_limit: Annotated[
+        int, RangeField(gt=0, le=1000, description="Maximum open connections")
+    ]
+    pool_limit_per_host: Annotated[
+        int, RangeField(gt=0, le=1000, description="Maximum open connections per host")
+    ]
+    keepalive_timeout: Annotated[
+        float,
+        RangeField(gt=0, le=600, description="Idle keep-alive timeout in seconds"),
+    ]
+    chart_concurrency: Annotated[
+        int, RangeField(gt=0, le=100, description="Maximum in-flight chart renders")
+    ]
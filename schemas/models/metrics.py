@@ -0,0 +1,33 @@
+"""Command metrics configuration schemas."""
+
+from typing import Annotated
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class Metrics(BaseConfigModel):
+    """In-process command latency and event loop metrics."""
+
+    latency_window: Annotated[
+        int,
+        RangeField(
+            gt=0, le=100000, description="Latency samples kept per command histogram"
+        ),
+    ]
+    loop_lag_interval: Annotated[
+        float,
+        RangeField(gt=0, le=60, description="Seconds between event loop lag probes"),
+    ]
+    loop_lag_threshold: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=60,
+            description="Seconds the loop may stay blocked before its stack is captured",
+        ),
+    ]
+    loop_stalls_kept: Annotated[
+        int,
+        RangeField(gt=0, le=1000, description="Captured loop stalls kept in memory"),
+    ]
@@ -0,0 +1,39 @@
+"""Render worker pool configuration schemas."""
+
+from typing import Annotated
+
+from pydantic import Field
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class Render(BaseConfigModel):
+    """Process pool configuration for CPU-heavy renders (heatmaps, local charts)."""
+
+    workers: Annotated[
+        int, RangeField(gt=0, le=64, description="Number of render worker processes")
+    ]
+    max_pending: Annotated[
+        int,
+        RangeField(gt=0, le=1000, description="Maximum queued and running renders"),
+    ]
+    queue_timeout: Annotated[
+        float,
+        RangeField(gt=0, le=600, description="Seconds to wait for a free queue slot"),
+    ]
+    charts: Annotated[
+        str,
+        Field(
+            pattern=r"^(remote|local|fallback)$",
+            description="Where charts are drawn: the chart API, the render pool, or the pool when the API fails",
+        ),
+    ]
+    chart_fallback_after: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=300,
+            description="Seconds to wait on the chart API before drawing the chart locally",
+        ),
+    ]
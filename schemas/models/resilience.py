@@ -0,0 +1,59 @@
+"""Upstream failure handling configuration schemas."""
+
+from typing import Annotated
+
+from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
+
+
+class Resilience(BaseConfigModel):
+    """Circuit breaker, retry and deadline settings for upstream APIs."""
+
+    failure_threshold: Annotated[
+        int,
+        RangeField(
+            gt=0,
+            le=100,
+            description="Failures in a row that open an upstream's circuit",
+        ),
+    ]
+    reset_timeout: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=3600,
+            description="Seconds an open circuit fails fast before a probe",
+        ),
+    ]
+    retries: Annotated[
+        int,
+        RangeField(ge=0, le=10, description="Extra attempts for idempotent reads"),
+    ]
+    retry_base_delay: Annotated[
+        float,
+        RangeField(
+            gt=0, le=60, description="Backoff before the first retry in seconds"
+        ),
+    ]
+    retry_max_delay: Annotated[
+        float,
+        RangeField(
+            gt=0, le=300, description="Longest backoff between retries in seconds"
+        ),
+    ]
+    interaction_budget: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=900,
+            description="Seconds after an interaction is created that upstream calls may run",
+        ),
+    ]
+    shared_call_budget: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=900,
+            description="Seconds a call shared by coalesced callers may run",
+        ),
+    ]
@@ -1,8 +1,11 @@
 """Server configuration schemas."""
 
+from typing import Annotated
+
 from pydantic import model_validator
 
 from schemas.base import BaseConfigModel
+from schemas.validators import RangeField
 
 
 class KeepAlive(BaseConfigModel):
@@ -11,6 +14,14 @@ class KeepAlive(BaseConfigModel):
     enabled: bool
     host: str
     port: str
+    max_heartbeat_age: Annotated[
+        float,
+        RangeField(
+            gt=0,
+            le=3600,
+            description="Seconds since the last heartbeat ack before /health fails",
+        ),
+    ]
 
 
 class Server(BaseConfigModel):
@@ -0,0 +1,143 @@
+"""Outbound service clients for SpooBot.
+
+This package wraps every external API the bot talks to behind
+asyncio-native clients that share a single pooled HTTP session.
+"""
+
+from services.exceptions import (
+    ServiceError,
+    SpooApiError,
+    ChartApiError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RenderQueueFullError,
+)
+from services.http import get_session, close_session
+from services.resilience import (
+    CircuitBreaker,
+    breakers,
+    call_upstream,
+    current_deadline,
+    start_deadline,
+    time_left,
+    upstream_unavailable,
+)
+from services.spoo import SpooClient, spoo_client
+from services.cache import TTLCache, ChartCache
+from services.singleflight import SingleFlight
+from services.statistics import LinkStatistics, StatisticsService, statistics_service
+from services.site_metrics import SiteMetricsService, site_metrics
+from services.exports import Export, ExportEngine, export_engine
+from services.metrics import (
+    LatencyHistogram,
+    PhaseTimer,
+    CommandMetrics,
+    command_metrics,
+    current_timer,
+    start_timer,
+    phase,
+    UpstreamMetrics,
+    upstream_metrics,
+    register_cache,
+    register_queue,
+    register_flight,
+)
+from services.loop_monitor import LoopLagMonitor, LoopStall, loop_monitor
+from services.gateway import GatewayMetrics, ShardState, gateway_metrics, shard_states
+from services.exposition import render_metrics
+from services.state import (
+    StateBackend,
+    MemoryStateBackend,
+    SQLiteStateBackend,
+    create_state_backend,
+    shared_state,
+)
+from services.cluster import (
+    ClusterIdentity,
+    ClusterReporter,
+    cluster_reporter,
+    cluster_statuses,
+    current_cluster,
+)
+
+# services.heatmap pulls in the plotting stack and is only used by render workers
+from services.render import HeatmapRenderer, heatmap_renderer
+from services.workers import HeatmapStyle
+
+__all__: list[str] = [
+    # Exceptions
+    "ServiceError",
+    "SpooApiError",
+    "ChartApiError",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "RenderQueueFullError",
+    # HTTP session
+    "get_session",
+    "close_session",
+    # Upstream failure handling
+    "CircuitBreaker",
+    "breakers",
+    "call_upstream",
+    "current_deadline",
+    "start_deadline",
+    "time_left",
+    "upstream_unavailable",
+    # spoo.me API
+    "SpooClient",
+    "spoo_client",
+    # Caching
+    "TTLCache",
+    "ChartCache",
+    "SingleFlight",
+    # Statistics
+    "LinkStatistics",
+    "StatisticsService",
+    "statistics_service",
+    # spoo.me site metrics
+    "SiteMetricsService",
+    "site_metrics",
+    # Exports
+    "Export",
+    "ExportEngine",
+    "export_engine",
+    # Command metrics
+    "LatencyHistogram",
+    "PhaseTimer",
+    "CommandMetrics",
+    "command_metrics",
+    "current_timer",
+    "start_timer",
+    "phase",
+    # Service metrics
+    "UpstreamMetrics",
+    "upstream_metrics",
+    "register_cache",
+    "register_queue",
+    "register_flight",
+    "LoopLagMonitor",
+    "LoopStall",
+    "loop_monitor",
+    "render_metrics",
+    # Gateway shards
+    "GatewayMetrics",
+    "ShardState",
+    "gateway_metrics",
+    "shard_states",
+    # Shared state
+    "StateBackend",
+    "MemoryStateBackend",
+    "SQLiteStateBackend",
+    "create_state_backend",
+    "shared_state",
+    # Clusters
+    "ClusterIdentity",
+    "ClusterReporter",
+    "cluster_reporter",
+    "cluster_statuses",
+    "current_cluster",
+    # Heatmap rendering
+    "HeatmapRenderer",
+    "HeatmapStyle",
+    "heatmap_renderer",
+]
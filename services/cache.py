@@ -0,0 +1,154 @@
+"""In-memory caches shared by the service clients."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire after a fixed time-to-live.
+
+    Once ``max_size`` entries are stored, the least recently used one is
+    evicted to make room for the next.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key``, or ``default`` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove ``key`` and return its value, or ``default`` if absent."""
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit/miss counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ChartCache:
+    """Content-addressed cache of rendered chart URLs.
+
+    Entries are keyed by a hash of the canonical chart payload. Lookups hit
+    an in-memory :class:`TTLCache` first and, when ``sqlite_path`` is set,
+    fall back to an SQLite table that survives restarts, opened on first use.
+    """
+
+    def __init__(self, max_size: int, ttl: float, sqlite_path: str = "") -> None:
+        self.ttl: float = ttl
+        self.sqlite_path: str = sqlite_path
+        self.memory: TTLCache = TTLCache(max_size=max_size, ttl=ttl)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.disk_hits: int = 0
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """The SQLite tier, opened on first use; ``None`` when it is disabled."""
+        if self._db is None and self.sqlite_path:
+            self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+            # WAL keeps lookups and inserts cheap enough to run on the event loop
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS charts "
+                "(key TEXT PRIMARY KEY, url TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM charts WHERE expires_at <= ?", (time.time(),))
+            self._db.commit()
+        return self._db
+
+    def get(self, key: str) -> str | None:
+        """Return the cached chart URL for ``key``, if any."""
+        url = self.memory.get(key)
+        if url is None and self.sqlite_path:
+            with self._lock:
+                row = (
+                    self._connection()
+                    .execute(
+                        "SELECT url FROM charts WHERE key = ? AND expires_at > ?",
+                        (key, time.time()),
+                    )
+                    .fetchone()
+                )
+            if row is not None:
+                url = row[0]
+                self.disk_hits += 1
+                self.memory.set(key, url)
+
+        if url is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return url
+
+    def set(self, key: str, url: str) -> None:
+        """Store a chart URL in every enabled tier."""
+        self.memory.set(key, url)
+        if not self.sqlite_path:
+            return
+
+        with self._lock:
+            db = self._connection()
+            db.execute(
+                "INSERT OR REPLACE INTO charts (key, url, expires_at) VALUES (?, ?, ?)",
+                (key, url, time.time() + self.ttl),
+            )
+            db.commit()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from either tier."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        """Return the hit/miss counters of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "hit_rate": self.hit_rate,
+            "size": len(self.memory),
+        }
@@ -0,0 +1,170 @@
+"""Chart.js payload rendering, executed inside the render worker processes.
+
+Draws the bar and line charts built by ``utils.build_chart_payload`` with
+matplotlib, as a local stand-in for the chart API. Only the options the
+bot actually sets are read; line tension is ignored, so lines are drawn
+straight between points.
+"""
+
+import io
+import re
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Same output size as the chart API: 500x300 at a device pixel ratio of 2
+WIDTH = 1000
+HEIGHT = 600
+DPI = 100
+DEVICE_PIXEL_RATIO = 2
+
+# Chart.js' default tick and legend font size, and title padding, in CSS pixels
+DEFAULT_FONT_SIZE = 12
+TITLE_PADDING = 10
+
+
+def css_color(color: str) -> tuple[float, float, float, float]:
+    """Convert an ``rgb(r, g, b)``/``rgba(r, g, b, a)`` string to a matplotlib color."""
+    values = [float(value) for value in re.findall(r"[\d.]+", color)]
+    red, green, blue = values[:3]
+    alpha = values[3] if len(values) > 3 else 1.0
+    return red / 255, green / 255, blue / 255, alpha
+
+
+def points(css_pixels: float) -> float:
+    """Convert a Chart.js size in CSS pixels to matplotlib points."""
+    return css_pixels * DEVICE_PIXEL_RATIO * 72 / DPI
+
+
+def enabled(value) -> bool:
+    # The payload spells its booleans as the strings "true"/"false"
+    return value is True or value == "true"
+
+
+def generate_chart(payload: dict) -> Figure:
+    """Draw the bar, horizontal bar or line chart of a chart API request body.
+
+    The figure is not registered with pyplot, so nothing is shared between
+    renders and it is freed as soon as the caller drops it.
+    """
+    chart = payload["chart"]
+    chart_type = chart["type"]
+    labels = chart["data"]["labels"]
+    datasets = chart["data"]["datasets"]
+    options = chart["options"]
+    scales = options["scales"]
+    title = options["plugins"]["title"]
+    legend = options["plugins"]["legend"]
+    padding = options["layout"]["padding"]
+    background = css_color(payload.get("backgroundColor", "rgb(255, 255, 255)"))
+
+    figure = Figure(figsize=(WIDTH / DPI, HEIGHT / DPI), dpi=DPI, facecolor=background)
+    FigureCanvasAgg(figure)
+    # The layout padding is a margin around everything, in CSS pixels
+    left, right, top, bottom = (
+        padding[side] * DEVICE_PIXEL_RATIO / size
+        for side, size in (
+            ("left", WIDTH),
+            ("right", WIDTH),
+            ("top", HEIGHT),
+            ("bottom", HEIGHT),
+        )
+    )
+    figure.set_layout_engine(
+        "constrained",
+        h_pad=TITLE_PADDING * DEVICE_PIXEL_RATIO / DPI,
+        rect=(left, bottom, 1 - left - right, 1 - top - bottom),
+    )
+    axes = figure.add_subplot()
+    axes.set_facecolor(background)
+
+    positions = range(len(labels))
+    for dataset in datasets:
+        fill = css_color(dataset["backgroundColor"])
+        border = css_color(dataset["borderColor"])
+        width = points(dataset["borderWidth"])
+        if chart_type == "line":
+            axes.plot(
+                positions,
+                dataset["data"],
+                color=border,
+                linewidth=width,
+                marker="o",
+                label=dataset["label"],
+            )
+            if dataset["fill"]:
+                axes.fill_between(positions, dataset["data"], color=fill)
+        elif chart_type == "horizontalBar":
+            axes.barh(
+                positions,
+                dataset["data"],
+                color=fill,
+                edgecolor=border,
+                linewidth=width,
+                label=dataset["label"],
+            )
+        else:
+            # The x axis is stacked, so every dataset shares one bar slot
+            axes.bar(
+                positions,
+                dataset["data"],
+                color=fill,
+                edgecolor=border,
+                linewidth=width,
+                label=dataset["label"],
+            )
+
+    category_axis, value_axis = (
+        (axes.yaxis, axes.xaxis)
+        if chart_type == "horizontalBar"
+        else (axes.xaxis, axes.yaxis)
+    )
+    category_axis.set_ticks(positions, labels)
+    if enabled(scales["y"].get("beginAtZero")):
+        if chart_type == "horizontalBar":
+            axes.set_xlim(left=0)
+        else:
+            axes.set_ylim(bottom=0)
+    value_axis.get_major_locator().set_params(integer=True)
+
+    for name, axis in (("x", axes.xaxis), ("y", axes.yaxis)):
+        axis.grid(True, color=css_color(scales[name]["grid"]["color"]))
+        axis.set_tick_params(
+            colors=css_color(scales[name]["ticks"]["color"]),
+            labelsize=points(DEFAULT_FONT_SIZE),
+            length=0,
+        )
+    axes.set_axisbelow(True)
+    for spine in axes.spines.values():
+        spine.set_visible(False)
+    if len(labels) > 6 and chart_type != "horizontalBar":
+        for label in axes.get_xticklabels():
+            label.set(rotation=45, horizontalalignment="right", rotation_mode="anchor")
+
+    # Title, then legend, above the plot like Chart.js lays them out
+    if enabled(title.get("display")):
+        figure.suptitle(
+            title["text"],
+            color=css_color(title["color"]),
+            fontsize=points(title["fontSize"]),
+            fontweight=title["fontStyle"],
+        )
+    if enabled(legend.get("display")) and datasets:
+        axes.legend(
+            loc="lower center",
+            bbox_to_anchor=(0.5, 1.0),
+            ncols=len(datasets),
+            frameon=False,
+            labelcolor=css_color(legend["labels"]["color"]),
+            fontsize=points(DEFAULT_FONT_SIZE),
+        )
+
+    return figure
+
+
+def render_chart(payload: dict) -> bytes:
+    """Render a chart API request body and return the PNG bytes."""
+    figure = generate_chart(payload)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", facecolor=figure.get_facecolor())
+    return buffer.getvalue()
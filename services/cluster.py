@@ -0,0 +1,114 @@
+"""Cluster identity and status reporting for multi-process runs.
+
+``cluster.py`` starts one bot process per cluster and tells each which
+shards it owns through environment variables. Every cluster then
+publishes a small status record to the shared state, which the
+supervisor watches for liveness and ``/bot-stats`` aggregates.
+"""
+
+import asyncio
+import math
+import os
+import time
+from typing import NamedTuple
+
+import discord
+
+from config import config
+from services.state import StateBackend, shared_state
+
+ENV_CLUSTER_ID = "SPOOBOT_CLUSTER_ID"
+ENV_SHARD_IDS = "SPOOBOT_SHARD_IDS"
+ENV_SHARD_COUNT = "SPOOBOT_SHARD_COUNT"
+
+STATUS_PREFIX = "cluster:"
+
+
+class ClusterIdentity(NamedTuple):
+    """The slice of shards one cluster process owns."""
+
+    cluster_id: int
+    shard_ids: list[int]
+    shard_count: int  # Across all clusters
+
+
+def cluster_identity() -> ClusterIdentity | None:
+    """Return the identity assigned by the launcher, or ``None`` when run directly."""
+    if ENV_CLUSTER_ID not in os.environ:
+        return None
+
+    return ClusterIdentity(
+        cluster_id=int(os.environ[ENV_CLUSTER_ID]),
+        shard_ids=[int(shard) for shard in os.environ[ENV_SHARD_IDS].split(",")],
+        shard_count=int(os.environ[ENV_SHARD_COUNT]),
+    )
+
+
+def status_key(cluster_id: int) -> str:
+    return f"{STATUS_PREFIX}{cluster_id}"
+
+
+class ClusterReporter:
+    """Publishes this cluster's status to the shared state every ``interval`` seconds.
+
+    The updates come from a task on the bot's event loop, so a cluster whose
+    loop is stuck stops reporting and the supervisor can restart it.
+    """
+
+    def __init__(
+        self, state: StateBackend, identity: ClusterIdentity | None, interval: float
+    ) -> None:
+        self.state: StateBackend = state
+        self.identity: ClusterIdentity | None = identity
+        self.interval: float = interval
+        self._task: asyncio.Task | None = None
+
+    def status(self, client: discord.Client) -> dict:
+        latency = client.latency
+        return {
+            "cluster_id": self.identity.cluster_id,
+            "pid": os.getpid(),
+            "shard_ids": self.identity.shard_ids,
+            "guilds": len(client.guilds),
+            "members": sum(guild.member_count or 0 for guild in client.guilds),
+            "latency": None if math.isnan(latency) else latency,
+            "ready": client.is_ready(),
+            "updated_at": time.time(),
+        }
+
+    def start(self, client: discord.Client) -> None:
+        if self.identity is None or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._report(client))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        await self.state.delete(status_key(self.identity.cluster_id))
+
+    async def _report(self, client: discord.Client) -> None:
+        key = status_key(self.identity.cluster_id)
+        while True:
+            try:
+                # Expire with the supervisor's timeout, so a dead cluster's status goes away
+                await self.state.set(
+                    key, self.status(client), ttl=config.cluster.heartbeat_timeout
+                )
+            except Exception as e:
+                print(f"Error publishing cluster status: {e}")
+            await asyncio.sleep(self.interval)
+
+
+async def cluster_statuses(state: StateBackend = shared_state) -> list[dict]:
+    """Return the latest status of every cluster, ordered by cluster id."""
+    statuses = await state.items(STATUS_PREFIX)
+    return sorted(statuses.values(), key=lambda status: status["cluster_id"])
+
+
+current_cluster = cluster_identity()
+
+cluster_reporter = ClusterReporter(
+    shared_state, current_cluster, config.cluster.status_interval
+)
@@ -0,0 +1,46 @@
+"""Exceptions raised by the outbound service clients."""
+
+
+class ServiceError(Exception):
+    """Base exception for errors talking to external services."""
+
+    pass
+
+
+class SpooApiError(ServiceError):
+    """Raised when the spoo.me API returns a non-success response."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"Error {status}: {message}")
+        self.status = status
+
+
+class RenderQueueFullError(ServiceError):
+    """Raised when the render pool has no free slot within the queue timeout."""
+
+    pass
+
+
+class ChartApiError(ServiceError):
+    """Raised when the chart API returns a non-success response."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"Error {status}: {message}")
+        self.status = status
+
+
+class CircuitOpenError(ServiceError):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+    def __init__(self, upstream: str, retry_after: float) -> None:
+        super().__init__(
+            f"{upstream} is unavailable, retrying in {retry_after:.0f} seconds"
+        )
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(ServiceError):
+    """Raised when the interaction's time budget runs out before an upstream answers."""
+
+    pass
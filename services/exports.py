@@ -0,0 +1,165 @@
+"""In-memory statistics exports (JSON, zipped CSV and Excel)."""
+
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import zipfile
+from typing import IO, Any, Callable, NamedTuple
+
+from config import config
+from services.metrics import phase
+
+# (statistics key, Excel sheet name, column headers); CSV files are named after the key
+TABLES: tuple[tuple[str, str, tuple[str, str]], ...] = (
+    ("browser", "Browser", ("Browser", "Count")),
+    ("counter", "Counter", ("Date", "Count")),
+    ("country", "Country", ("Country", "Count")),
+    ("os_name", "OS_Name", ("OS_Name", "Count")),
+    ("referrer", "Referrer", ("Referrer", "Count")),
+    ("unique_browser", "Unique_Browser", ("Browser", "Count")),
+    ("unique_counter", "Unique_Counter", ("Date", "Count")),
+    ("unique_country", "Unique_Country", ("Country", "Count")),
+    ("unique_os_name", "Unique_OS_Name", ("OS_Name", "Count")),
+    ("unique_referrer", "Unique_Referrer", ("Referrer", "Count")),
+)
+
+# (column header, statistics key) for the single-row general info table
+GENERAL_INFO: tuple[tuple[str, str], ...] = (
+    ("TOTAL CLICKS", "total-clicks"),
+    ("TOTAL UNIQUE CLICKS", "total_unique_clicks"),
+    ("URL", "url"),
+    ("SHORT CODE", "_id"),
+    ("MAX CLICKS", "max-clicks"),
+    ("PASSWORD", "password"),
+    ("CREATION DATE", "creation-date"),
+    ("EXPIRED", "expired"),
+    ("AVERAGE DAILY CLICKS", "average_daily_clicks"),
+    ("AVERAGE MONTHLY CLICKS", "average_monthly_clicks"),
+    ("AVERAGE WEEKLY CLICKS", "average_weekly_clicks"),
+    ("LAST CLICK", "last-click"),
+    ("LAST CLICK BROSWER", "last-click-browser"),
+    ("LAST CLICK OS", "last-click-os"),
+)
+
+
+def _table_rows(data: dict[str, Any], key: str) -> list[tuple[Any, Any]]:
+    return list((data.get(key) or {}).items())
+
+
+def _general_info(data: dict[str, Any]) -> tuple[list[str], list[Any]]:
+    return (
+        [header for header, _ in GENERAL_INFO],
+        [data.get(key) for _, key in GENERAL_INFO],
+    )
+
+
+def write_json(data: dict[str, Any], buffer: IO[bytes]) -> None:
+    buffer.write(json.dumps(data, indent=4).encode())
+
+
+def write_csv_zip(data: dict[str, Any], buffer: IO[bytes]) -> None:
+    """Write one CSV per table into a zip archive, mirroring ``Statistics.export_to_csv``."""
+
+    def to_csv(header: list[str], rows: list) -> bytes:
+        text = io.StringIO()
+        writer = csv.writer(text, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+        return text.getvalue().encode()
+
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for key, _, columns in TABLES:
+            archive.writestr(f"{key}.csv", to_csv(columns, _table_rows(data, key)))
+
+        header, row = _general_info(data)
+        archive.writestr("general_info.csv", to_csv(header, [row]))
+
+
+def write_xlsx(data: dict[str, Any], buffer: IO[bytes]) -> None:
+    """Write one sheet per table, mirroring ``Statistics.export_to_excel``."""
+    # Imported on first use, in the export thread, to keep it off bot startup
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    header_font = Font(bold=True)
+    header_border = Border(
+        left=Side(style="thin"),
+        right=Side(style="thin"),
+        top=Side(style="thin"),
+        bottom=Side(style="thin"),
+    )
+    header_alignment = Alignment(horizontal="center", vertical="top")
+    workbook = Workbook(write_only=True)
+
+    def add_sheet(title: str, header: list[str] | tuple[str, ...], rows: list) -> None:
+        sheet = workbook.create_sheet(title)
+        cells = []
+        for value in header:
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.font = header_font
+            cell.border = header_border
+            cell.alignment = header_alignment
+            cells.append(cell)
+        sheet.append(cells)
+        for row in rows:
+            sheet.append(row)
+
+    for key, title, columns in TABLES:
+        add_sheet(title, columns, _table_rows(data, key))
+
+    header, row = _general_info(data)
+    add_sheet("General_Info", header, [row])
+
+    workbook.save(buffer)
+
+
+WRITERS: dict[str, Callable[[dict[str, Any], IO[bytes]], None]] = {
+    "json": write_json,
+    "csv": write_csv_zip,
+    "xlsx": write_xlsx,
+}
+
+
+class Export(NamedTuple):
+    """A finished export, rewound and ready to upload."""
+
+    file: IO[bytes]
+    size: int
+
+
+class ExportEngine:
+    """Serializes statistics exports into per-request buffers off the event loop.
+
+    Each export gets its own buffer, so concurrent exports never share a file.
+    Buffers stay in memory until they grow past ``spool_threshold`` bytes, after
+    which they transparently spill to an anonymous temporary file.
+    """
+
+    def __init__(self, spool_threshold: int) -> None:
+        self.spool_threshold: int = spool_threshold
+
+    async def export(self, data: dict[str, Any], filetype: str) -> Export:
+        if filetype not in WRITERS:
+            raise ValueError(
+                "Invalid file type. Choose either 'csv', 'json' or 'xlsx'."
+            )
+        with phase("render"):
+            return await asyncio.to_thread(self._export, data, filetype)
+
+    def _export(self, data: dict[str, Any], filetype: str) -> Export:
+        buffer = tempfile.SpooledTemporaryFile(max_size=self.spool_threshold)
+        try:
+            WRITERS[filetype](data, buffer)
+        except BaseException:
+            buffer.close()
+            raise
+
+        size = buffer.tell()
+        buffer.seek(0)
+        return Export(buffer, size)
+
+
+export_engine = ExportEngine(config.exports.spool_threshold)
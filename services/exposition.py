@@ -0,0 +1,311 @@
+"""Prometheus text exposition of the bot's in-process metrics."""
+
+import math
+from typing import Iterable
+
+import discord
+
+from services.gateway import shard_states
+from services.loop_monitor import loop_monitor
+from services.metrics import (
+    LatencyHistogram,
+    caches,
+    command_metrics,
+    flights,
+    queues,
+    upstream_metrics,
+)
+from services.resilience import HALF_OPEN, OPEN, breakers
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+QUANTILES: tuple[float, ...] = (50, 95, 99)
+
+Sample = tuple[dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in labels.items()
+    )
+    return f"{{{pairs}}}"
+
+
+def _metric(
+    lines: list[str],
+    name: str,
+    kind: str,
+    description: str,
+    samples: Iterable[Sample],
+) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {kind}")
+    for labels, value in samples:
+        lines.append(f"{name}{_labels(labels)} {_format(value)}")
+
+
+def _summary(
+    lines: list[str],
+    name: str,
+    description: str,
+    histograms: Iterable[tuple[dict[str, str], LatencyHistogram]],
+) -> None:
+    """Export millisecond histograms as a summary in seconds.
+
+    Quantiles cover the buffered window; ``_sum`` and ``_count`` are lifetime
+    totals, so rates computed from them are exact.
+    """
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} summary")
+    for labels, histogram in histograms:
+        values = histogram.percentiles(*QUANTILES)
+        for quantile, value in zip(QUANTILES, values):
+            sample_labels = {**labels, "quantile": str(quantile / 100)}
+            lines.append(f"{name}{_labels(sample_labels)} {_format(value / 1000)}")
+        lines.append(f"{name}_sum{_labels(labels)} {_format(histogram.sum / 1000)}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+
+def render_metrics(bot: discord.Client | None = None) -> str:
+    """Render every metric in the Prometheus text format.
+
+    Must run on the bot's event loop, since it reads gateway and cache state
+    that the loop mutates.
+    """
+    lines: list[str] = []
+
+    if bot is not None:
+        _metric(
+            lines,
+            "spoobot_gateway_latency_seconds",
+            "gauge",
+            "Latency between a gateway heartbeat and its acknowledgement, averaged across shards.",
+            [({}, bot.latency)],
+        )
+        _metric(
+            lines,
+            "spoobot_guilds",
+            "gauge",
+            "Guilds the bot is a member of.",
+            [({}, len(bot.guilds))],
+        )
+        _metric(
+            lines,
+            "spoobot_users",
+            "gauge",
+            "Members across all guilds, as reported by Discord.",
+            [({}, sum(guild.member_count or 0 for guild in bot.guilds))],
+        )
+
+        shards = shard_states(bot)
+        _metric(
+            lines,
+            "spoobot_shard_connected",
+            "gauge",
+            "Whether the shard's gateway websocket is open.",
+            [
+                ({"shard": str(shard.shard_id)}, int(shard.connected))
+                for shard in shards
+            ],
+        )
+        _metric(
+            lines,
+            "spoobot_shard_latency_seconds",
+            "gauge",
+            "Heartbeat latency of the shard's gateway connection.",
+            [({"shard": str(shard.shard_id)}, shard.latency) for shard in shards],
+        )
+        _metric(
+            lines,
+            "spoobot_shard_guilds",
+            "gauge",
+            "Guilds served by the shard.",
+            [({"shard": str(shard.shard_id)}, shard.guilds) for shard in shards],
+        )
+        _metric(
+            lines,
+            "spoobot_shard_disconnects_total",
+            "counter",
+            "Times the shard lost its gateway connection.",
+            [({"shard": str(shard.shard_id)}, shard.disconnects) for shard in shards],
+        )
+        _metric(
+            lines,
+            "spoobot_shard_resumes_total",
+            "counter",
+            "Times the shard resumed its gateway session.",
+            [({"shard": str(shard.shard_id)}, shard.resumes) for shard in shards],
+        )
+
+    _summary(
+        lines,
+        "spoobot_command_latency_seconds",
+        "End-to-end latency of commands.",
+        [
+            ({"command": command}, histogram)
+            for command, histogram in sorted(command_metrics.commands.items())
+        ],
+    )
+    _summary(
+        lines,
+        "spoobot_command_phase_latency_seconds",
+        "Time spent in each phase of a command, by outcome.",
+        [
+            ({"command": command, "outcome": outcome, "phase": name}, histogram)
+            for (command, outcome, name), histogram in sorted(
+                command_metrics.phases.items()
+            )
+        ],
+    )
+    _metric(
+        lines,
+        "spoobot_command_outcomes_total",
+        "counter",
+        "Finished commands by outcome.",
+        [
+            ({"command": command, "outcome": outcome}, count)
+            for (command, outcome), count in sorted(command_metrics.outcomes.items())
+        ],
+    )
+
+    named_caches = sorted(caches.items())
+    _metric(
+        lines,
+        "spoobot_cache_hits_total",
+        "counter",
+        "Cache lookups served from the cache.",
+        [({"cache": name}, cache.hits) for name, cache in named_caches],
+    )
+    _metric(
+        lines,
+        "spoobot_cache_misses_total",
+        "counter",
+        "Cache lookups that missed.",
+        [({"cache": name}, cache.misses) for name, cache in named_caches],
+    )
+    _metric(
+        lines,
+        "spoobot_cache_hit_ratio",
+        "gauge",
+        "Fraction of cache lookups served from the cache.",
+        [({"cache": name}, cache.hit_rate) for name, cache in named_caches],
+    )
+
+    named_flights = sorted(flights.items())
+    _metric(
+        lines,
+        "spoobot_singleflight_calls_total",
+        "counter",
+        "Upstream calls started by a single-flight group.",
+        [({"group": name}, flight.calls) for name, flight in named_flights],
+    )
+    _metric(
+        lines,
+        "spoobot_singleflight_shared_total",
+        "counter",
+        "Callers that joined a call already in flight instead of starting one.",
+        [({"group": name}, flight.shared) for name, flight in named_flights],
+    )
+    _metric(
+        lines,
+        "spoobot_singleflight_inflight",
+        "gauge",
+        "Distinct calls currently in flight.",
+        [({"group": name}, len(flight)) for name, flight in named_flights],
+    )
+
+    _metric(
+        lines,
+        "spoobot_render_queue_depth",
+        "gauge",
+        "Renders queued or running.",
+        [({"queue": name}, depth()) for name, depth in sorted(queues.items())],
+    )
+
+    upstreams = sorted(upstream_metrics.requests)
+    _metric(
+        lines,
+        "spoobot_upstream_requests_total",
+        "counter",
+        "Requests sent to upstream APIs.",
+        [({"upstream": name}, upstream_metrics.requests[name]) for name in upstreams],
+    )
+    _metric(
+        lines,
+        "spoobot_upstream_errors_total",
+        "counter",
+        "Upstream requests that failed or returned an error status.",
+        [({"upstream": name}, upstream_metrics.errors[name]) for name in upstreams],
+    )
+    _metric(
+        lines,
+        "spoobot_upstream_retries_total",
+        "counter",
+        "Failed idempotent requests that were retried.",
+        [({"upstream": name}, upstream_metrics.retries[name]) for name in upstreams],
+    )
+
+    named_breakers = sorted(breakers.items())
+    _metric(
+        lines,
+        "spoobot_circuit_breaker_state",
+        "gauge",
+        "Circuit breaker state: 0 closed, 1 half-open, 2 open.",
+        [
+            ({"upstream": name}, {HALF_OPEN: 1, OPEN: 2}.get(breaker.state, 0))
+            for name, breaker in named_breakers
+        ],
+    )
+    _metric(
+        lines,
+        "spoobot_circuit_breaker_opens_total",
+        "counter",
+        "Times a circuit breaker opened.",
+        [({"upstream": name}, breaker.opens) for name, breaker in named_breakers],
+    )
+
+    _metric(
+        lines,
+        "spoobot_event_loop_lag_seconds",
+        "gauge",
+        "How late the event loop resumed the latest lag probe.",
+        [({}, loop_monitor.lag)],
+    )
+    _summary(
+        lines,
+        "spoobot_event_loop_lag_distribution_seconds",
+        "How late the event loop resumed its lag probes.",
+        [({}, loop_monitor.histogram)],
+    )
+    _metric(
+        lines,
+        "spoobot_event_loop_lag_max_seconds",
+        "gauge",
+        "Worst event loop lag seen since startup.",
+        [({}, loop_monitor.max_lag)],
+    )
+    _metric(
+        lines,
+        "spoobot_event_loop_stalls_total",
+        "counter",
+        "Times the event loop stayed blocked past the stall threshold.",
+        [({}, loop_monitor.stall_count)],
+    )
+
+    return "\n".join(lines) + "\n"
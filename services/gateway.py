@@ -0,0 +1,65 @@
+"""Gateway connection state and reconnect counters, per shard."""
+
+import time
+from collections import Counter
+from typing import NamedTuple
+
+import discord
+
+
+class ShardState(NamedTuple):
+    """Point-in-time view of one gateway connection."""
+
+    shard_id: int
+    connected: bool
+    latency: float  # Seconds between a heartbeat and its ack
+    last_heartbeat_ack: float | None  # Seconds ago
+    guilds: int
+    connects: int
+    disconnects: int
+    resumes: int
+
+
+class GatewayMetrics:
+    """Lifetime connect, disconnect and resume counts, by shard id."""
+
+    def __init__(self) -> None:
+        self.connects: Counter[int] = Counter()
+        self.disconnects: Counter[int] = Counter()
+        self.resumes: Counter[int] = Counter()
+
+
+gateway_metrics = GatewayMetrics()
+
+
+def _heartbeat_age(ws: discord.gateway.DiscordWebSocket | None) -> float | None:
+    keep_alive = getattr(ws, "_keep_alive", None)
+    if keep_alive is None:
+        return None
+    return time.perf_counter() - keep_alive._last_ack
+
+
+def shard_states(client: discord.Client) -> list[ShardState]:
+    """Describe every gateway connection of ``client``, sharded or not."""
+    if isinstance(client, discord.AutoShardedClient):
+        connections = [
+            (shard_id, shard._parent.ws, shard.latency)
+            for shard_id, shard in sorted(client.shards.items())
+        ]
+    else:
+        connections = [(client.shard_id or 0, client.ws, client.latency)]
+
+    guilds = Counter(guild.shard_id for guild in client.guilds)
+    return [
+        ShardState(
+            shard_id=shard_id,
+            connected=ws is not None and ws.open,
+            latency=latency,
+            last_heartbeat_ack=_heartbeat_age(ws),
+            guilds=guilds[shard_id],
+            connects=gateway_metrics.connects[shard_id],
+            disconnects=gateway_metrics.disconnects[shard_id],
+            resumes=gateway_metrics.resumes[shard_id],
+        )
+        for shard_id, ws, latency in connections
+    ]
@@ -0,0 +1,334 @@
+"""Countries heatmap rendering, executed inside the render worker processes.
+
+Everything here is CPU-bound and imports the heavy plotting stack, so it is
+only ever called through :class:`services.render.HeatmapRenderer`.
+"""
+
+import functools
+import io
+import struct
+import zlib
+from pathlib import Path
+
+import geopandas as gpd
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from mpl_toolkits.axes_grid1 import make_axes_locatable
+
+from services.workers import HeatmapStyle
+
+# Natural Earth 1:110m admin 0 countries, as geopandas used to bundle them
+WORLD_PATH = (
+    Path(__file__).resolve().parent.parent / "assets" / "naturalearth_lowres.geojson"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def load_world_geometry() -> tuple[gpd.GeoDataFrame, gpd.GeoSeries, dict[str, int]]:
+    """Load the world country shapes once and index them by country name.
+
+    Returns the geometry (name and shape columns only), its precomputed
+    boundaries and a country-name to row-position index.
+    """
+    world = gpd.read_file(WORLD_PATH)
+    world = world[["name", "geometry"]].reset_index(drop=True)
+    index = {name: position for position, name in enumerate(world["name"])}
+    return world, world.boundary, index
+
+
+def map_country_values(data: dict, index: dict[str, int]) -> np.ndarray:
+    """Project a country->count mapping onto the rows of the world geometry.
+
+    Countries missing from ``data`` are left as NaN so they are not filled.
+    """
+    values = np.full(len(index), np.nan)
+    matches = [
+        (index[country], count) for country, count in data.items() if country in index
+    ]
+    if matches:
+        positions, counts = zip(*matches)
+        values[list(positions)] = counts
+    return values
+
+
+def color_limits(values: np.ndarray) -> tuple[float, float]:
+    """Colour scale bounds for ``values``, ``(0, 1)`` when no country has data."""
+    finite = values[np.isfinite(values)]
+    return (finite.min(), finite.max()) if finite.size else (0, 1)
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
+
+
+def encode_png(
+    pixels: np.ndarray, dpi: int, compress_level: int, opaque: bool
+) -> bytes:
+    """Encode an RGBA pixel array as a PNG, dropping alpha when ``opaque``.
+
+    Pillow picks a filter for every row, which costs several times more
+    than compressing the rows themselves. The heatmap is mostly flat
+    colour that deflate handles well unfiltered, so rows are written as is.
+    """
+    height, width = pixels.shape[:2]
+    channels = 3 if opaque else 4
+    # Every row starts with its filter type byte, 0 meaning none
+    rows = np.zeros((height, 1 + width * channels), dtype=np.uint8)
+    rows[:, 1:] = pixels[..., :channels].reshape(height, -1)
+    pixels_per_metre = round(dpi / 0.0254)
+
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            png_chunk(
+                b"IHDR",
+                struct.pack(">IIBBBBB", width, height, 8, 2 if opaque else 6, 0, 0, 0),
+            ),
+            png_chunk(
+                b"pHYs", struct.pack(">IIB", pixels_per_metre, pixels_per_metre, 1)
+            ),
+            png_chunk(b"IDAT", zlib.compress(rows, compress_level)),
+            png_chunk(b"IEND", b""),
+        ]
+    )
+
+
+def generate_countries_heatmap(
+    data: dict,
+    style: HeatmapStyle,
+    title: str = "Countries Heatmap",
+    cmap: str = "YlOrRd",
+) -> Figure:
+    """Draw a countries heatmap on a standalone figure.
+
+    The figure is not registered with pyplot, so nothing is shared between
+    renders and it is freed as soon as the caller drops it.
+    """
+    world, boundary, index = load_world_geometry()
+    values = map_country_values(data, index)
+
+    # Create a figure and axis with background color from config
+    fig = Figure(figsize=(15, 10), facecolor=(*style.background, style.alpha))
+    ax = fig.subplots(1, 1)
+    fig.subplots_adjust(left=0.05, right=0.95, bottom=0.05, top=0.95)
+
+    for spine in ax.spines.values():
+        spine.set_color(style.grid_color)
+        spine.set_linewidth(style.border_width)
+
+    ax.tick_params(labelcolor=style.text_color)
+
+    boundary.plot(ax=ax, linewidth=1)
+    divider = make_axes_locatable(ax)
+    cax = divider.append_axes("right", size="5%", pad=0.1)
+
+    vmin, vmax = color_limits(values)
+    p = world.plot(
+        column=values,
+        ax=ax,
+        vmin=vmin,
+        vmax=vmax,
+        legend=True,
+        cax=cax,
+        cmap=cmap,
+        edgecolor=None,
+        legend_kwds={
+            "label": "Clicks",
+        },
+        alpha=style.alpha,
+    )
+    p.set_facecolor((*style.background, style.alpha))
+    cax.tick_params(labelcolor=style.text_color)
+
+    fig.suptitle(
+        title,
+        x=0.5,
+        y=0.82,
+        fontsize=style.title_font_size,
+        fontweight=style.title_font_weight,
+        color=style.title_color,
+    )
+
+    return fig
+
+
+# Extra canvas width in inches to the right of the basemap figure
+BASEMAP_MARGIN = 3
+
+
+class Basemap:
+    """A heatmap figure whose static layers are rasterised once.
+
+    The background, country boundaries, axes and spines never change
+    between requests, so they are drawn a single time and kept as a pixel
+    buffer. Each render restores that buffer and only draws the country
+    fills, the colorbar and the title on top of it.
+    """
+
+    def __init__(self, style: HeatmapStyle, cmap: str) -> None:
+        world, boundary, index = load_world_geometry()
+        self.style: HeatmapStyle = style
+
+        with matplotlib.rc_context(
+            {"font.size": style.font_size, "axes.labelcolor": style.text_color}
+        ):
+            # The colorbar labels can overflow a 15 inch wide figure, which
+            # savefig(bbox_inches="tight") handles by growing the canvas. Draw
+            # on a wider canvas instead, keeping every artist at the same
+            # position in inches, so nothing is clipped before cropping.
+            width = 15 + BASEMAP_MARGIN
+            self.figure = Figure(
+                figsize=(width, 10),
+                dpi=style.dpi,
+                facecolor=(*style.background, style.alpha),
+            )
+            self.canvas = FigureCanvasAgg(self.figure)
+            self.ax = self.figure.subplots(1, 1)
+            self.figure.subplots_adjust(
+                left=0.75 / width, right=14.25 / width, bottom=0.05, top=0.95
+            )
+
+            for spine in self.ax.spines.values():
+                spine.set_color(style.grid_color)
+                spine.set_linewidth(style.border_width)
+
+            self.ax.tick_params(labelcolor=style.text_color)
+
+            boundary.plot(ax=self.ax, linewidth=1)
+            divider = make_axes_locatable(self.ax)
+            self.cax = divider.append_axes("right", size="5%", pad=0.1)
+
+            world.plot(
+                column=np.zeros(len(index)),
+                ax=self.ax,
+                cmap=cmap,
+                edgecolor=None,
+                alpha=style.alpha,
+            )
+            self.fills = self.ax.collections[-1]
+            self.colorbar = self.figure.colorbar(
+                self.fills, cax=self.cax, label="Clicks"
+            )
+            self.ax.set_facecolor((*style.background, style.alpha))
+            self.cax.tick_params(labelcolor=style.text_color)
+
+            self.title = self.figure.suptitle(
+                "",
+                x=7.5 / width,
+                y=0.82,
+                fontsize=style.title_font_size,
+                fontweight=style.title_font_weight,
+                color=style.title_color,
+            )
+
+            # Rasterise everything that is shared between requests
+            self.fills.set_visible(False)
+            self.cax.set_visible(False)
+            self.canvas.draw()
+            self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+            self.fills.set_visible(True)
+            self.cax.set_visible(True)
+
+        self.index: dict[str, int] = index
+
+    def render(self, data: dict, title: str) -> bytes:
+        values = map_country_values(data, self.index)
+        vmin, vmax = color_limits(values)
+
+        with matplotlib.rc_context(
+            {
+                "font.size": self.style.font_size,
+                "axes.labelcolor": self.style.text_color,
+            }
+        ):
+            self.fills.set_array(values)
+            self.fills.set_clim(vmin, vmax)
+            self.colorbar.update_normal(self.fills)
+            self.title.set_text(title)
+
+            self.canvas.restore_region(self.background)
+            self.figure.draw_artist(self.fills)
+            for spine in self.ax.spines.values():
+                self.figure.draw_artist(spine)
+            self.figure.draw_artist(self.cax)
+            self.figure.draw_artist(self.title)
+
+            pixels = np.asarray(self.canvas.buffer_rgba())
+            if self.style.bbox_inches == "tight":
+                pixels = self._crop_tight(pixels)
+
+        return encode_png(
+            pixels, self.style.dpi, self.style.compress_level, self.style.alpha >= 1
+        )
+
+    def _crop_tight(self, pixels: np.ndarray) -> np.ndarray:
+        """Crop like ``savefig(bbox_inches="tight")`` would, padding with the
+        figure background where the padded box runs past the canvas."""
+        dpi = self.style.dpi
+        bbox = self.figure.get_tightbbox(self.canvas.get_renderer()).padded(
+            self.style.pad_inches
+        )
+        height = pixels.shape[0]
+        x0 = round(bbox.x0 * dpi)
+        # Figure coordinates grow upwards, array rows grow downwards
+        y0 = round(height - bbox.y1 * dpi)
+        x1, y1 = x0 + int(bbox.width * dpi), y0 + int(bbox.height * dpi)
+
+        if x0 >= 0 and y0 >= 0 and x1 <= pixels.shape[1] and y1 <= height:
+            return pixels[y0:y1, x0:x1]
+
+        cropped = np.empty((y1 - y0, x1 - x0, 4), dtype=pixels.dtype)
+        cropped[...] = np.asarray(pixels[0, 0])
+        src_y0, src_y1 = max(y0, 0), min(y1, height)
+        src_x0, src_x1 = max(x0, 0), min(x1, pixels.shape[1])
+        cropped[src_y0 - y0 : src_y1 - y0, src_x0 - x0 : src_x1 - x0] = pixels[
+            src_y0:src_y1, src_x0:src_x1
+        ]
+        return cropped
+
+
+# A basemap holds its canvas and a copy of it, about 130 MB at 300 dpi, and
+# the bot only ever renders with the one style and colormap from its config
+@functools.lru_cache(maxsize=1)
+def get_basemap(style: HeatmapStyle, cmap: str) -> Basemap:
+    """Return the cached basemap for a style and colormap, building it once."""
+    return Basemap(style, cmap)
+
+
+def render_heatmap(
+    data: dict, style: HeatmapStyle, title: str, cmap: str = "YlOrRd"
+) -> bytes:
+    """Render a countries heatmap straight into memory and return the PNG bytes."""
+    if style.render_mode == "basemap":
+        return get_basemap(style, cmap).render(data, title)
+
+    # Scope the style to this render instead of mutating the global rcParams
+    with matplotlib.rc_context(
+        {"font.size": style.font_size, "axes.labelcolor": style.text_color}
+    ):
+        figure = generate_countries_heatmap(data, style, title=title, cmap=cmap)
+        buffer = io.BytesIO()
+        figure.savefig(
+            buffer,
+            format="png",
+            bbox_inches=style.bbox_inches,
+            pad_inches=style.pad_inches,
+            dpi=style.dpi,
+            pil_kwargs={"compress_level": style.compress_level},
+        )
+    return buffer.getvalue()
+
+
+def warm_up() -> None:
+    """Process pool initializer: load the world geometry before the first job.
+
+    Errors are not caught: a worker that cannot load it breaks the pool.
+    """
+    load_world_geometry()
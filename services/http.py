@@ -0,0 +1,44 @@
+"""Shared aiohttp session for all outbound HTTP traffic.
+
+Every client in this package goes through one pooled session so that
+connections (and their TLS handshakes) are reused across commands instead
+of being opened per request.
+"""
+
+import aiohttp
+
+from config import config
+
+_session: aiohttp.ClientSession | None = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the process-wide session, creating it on first use.
+
+    Must be called from inside the running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        http_config = config.http
+        connector = aiohttp.TCPConnector(
+            limit=http_config.pool_limit,
+            limit_per_host=http_config.pool_limit_per_host,
+            keepalive_timeout=http_config.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=http_config.total_timeout,
+                connect=http_config.connect_timeout,
+            ),
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session and release its pooled connections."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -0,0 +1,109 @@
+"""Event loop lag measurement and blocking-callback attribution."""
+
+import asyncio
+import datetime
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import NamedTuple
+
+from config import config
+from services.metrics import LatencyHistogram
+
+
+class LoopStall(NamedTuple):
+    """A moment the event loop was blocked, with the stack that blocked it."""
+
+    at: datetime.datetime
+    blocked_for: float  # Seconds, when the stack was captured
+    stack: str
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a sleeping task.
+
+    Every ``interval`` seconds a probe task sleeps and checks how long past its
+    deadline it actually resumed. Anything blocking the loop (a synchronous
+    call, a long CPU-bound callback) shows up directly as lag.
+
+    A watchdog thread notices when the probe is more than ``threshold``
+    seconds overdue while the loop is still blocked, and captures the loop
+    thread's stack at that moment, so the offending callback is named
+    instead of only measured. The last ``max_stalls`` stalls are kept.
+    """
+
+    def __init__(
+        self, interval: float, threshold: float, window: int, max_stalls: int
+    ) -> None:
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self.lag: float = 0.0  # Seconds, of the latest probe
+        self.max_lag: float = 0.0
+        self.histogram: LatencyHistogram = LatencyHistogram(window)  # Milliseconds
+        self.stall_count: int = 0  # Lifetime number of captured stalls
+        self.stalls: deque[LoopStall] = deque(maxlen=max_stalls)
+        self._last_tick: float = time.perf_counter()
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start probing the running loop and watching it from a thread."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._loop_thread = threading.get_ident()
+        self._last_tick = time.perf_counter()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._probe())
+        threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _probe(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self._last_tick = now = time.perf_counter()
+            self.lag = max(now - expected, 0.0)
+            self.max_lag = max(self.max_lag, self.lag)
+            self.histogram.record(self.lag * 1000)
+
+    def _watch(self) -> None:
+        captured_tick = None
+        while not self._stopped.wait(self.threshold / 2):
+            last_tick = self._last_tick
+            blocked_for = time.perf_counter() - last_tick - self.interval
+            # One capture per stall; the probe moves the tick once the loop resumes
+            if blocked_for < self.threshold or last_tick == captured_tick:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+
+            captured_tick = last_tick
+            stack = "".join(traceback.format_stack(frame))
+            self.stall_count += 1
+            self.stalls.append(
+                LoopStall(datetime.datetime.now(datetime.UTC), blocked_for, stack)
+            )
+            print(
+                f"Event loop blocked for over {blocked_for * 1000:.0f} ms in:\n{stack}"
+            )
+
+
+loop_monitor = LoopLagMonitor(
+    interval=config.metrics.loop_lag_interval,
+    threshold=config.metrics.loop_lag_threshold,
+    window=config.metrics.latency_window,
+    max_stalls=config.metrics.loop_stalls_kept,
+)
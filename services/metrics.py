@@ -0,0 +1,203 @@
+"""In-process metrics for bot commands and the services they call."""
+
+import math
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from config import config
+
+
+class LatencyHistogram:
+    """Ring buffer of the most recent latency samples, in milliseconds.
+
+    Percentiles are computed over the last ``size`` samples, so a burst of
+    slow commands shows up in p95/p99 instead of being averaged away.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.count: int = 0  # Lifetime number of samples
+        self.sum: float = 0.0  # Lifetime sum of samples
+        self._samples: array = array("d", bytes(8 * size))
+        self._timestamps: array = array("d", bytes(8 * size))
+
+    def record(self, latency: float) -> None:
+        index = self.count % self.size
+        self._samples[index] = latency
+        self._timestamps[index] = time.monotonic()
+        self.count += 1
+        self.sum += latency
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    def percentiles(self, *quantiles: float) -> list[float]:
+        """Return the nearest-rank percentiles (0-100) of the buffered samples."""
+        samples = sorted(self._samples[: len(self)])
+        if not samples:
+            return [0.0 for _ in quantiles]
+        return [
+            samples[max(math.ceil(quantile / 100 * len(samples)) - 1, 0)]
+            for quantile in quantiles
+        ]
+
+    def throughput(self, window: float = 60.0) -> float:
+        """Samples per minute over the last ``window`` seconds.
+
+        Only buffered samples are counted, so rates above ``size`` per
+        ``window`` are under-reported.
+        """
+        cutoff = time.monotonic() - window
+        recent = sum(
+            1 for timestamp in self._timestamps[: len(self)] if timestamp >= cutoff
+        )
+        return recent * 60 / window
+
+
+class PhaseTimer:
+    """Wall-clock milliseconds spent in the named phases of one command."""
+
+    def __init__(self) -> None:
+        self.started_at: float = time.perf_counter()
+        self.outcome: str = "success"
+        self.phases: dict[str, float] = {}
+        self._active: set[str] = set()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        # A phase entered again while already running (a client call inside a
+        # service call, or a shared fetch task) is only counted once
+        if name in self._active:
+            yield
+            return
+
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._active.discard(name)
+            elapsed = (time.perf_counter() - start) * 1000
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def elapsed(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+
+# Timer of the command running in the current task, if any
+current_timer: ContextVar[PhaseTimer | None] = ContextVar("current_timer", default=None)
+
+
+def start_timer() -> PhaseTimer:
+    """Start timing a command and make it the current task's timer."""
+    timer = PhaseTimer()
+    current_timer.set(timer)
+    return timer
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Attribute the enclosed block to phase ``name`` of the current command.
+
+    Outside of a timed command this does nothing, so services can mark their
+    upstream calls and renders unconditionally.
+    """
+    timer = current_timer.get()
+    if timer is None:
+        yield
+        return
+
+    with timer.phase(name):
+        yield
+
+
+class CommandMetrics:
+    """Latency histograms for every command, plus one across all commands.
+
+    Phase timings are kept per ``(command, outcome, phase)``.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window: int = window
+        self.overall: LatencyHistogram = LatencyHistogram(window)
+        self.commands: dict[str, LatencyHistogram] = {}
+        self.phases: dict[tuple[str, str, str], LatencyHistogram] = {}
+        self.outcomes: Counter[tuple[str, str]] = Counter()
+
+    def _histogram(self, histograms: dict, key: object) -> LatencyHistogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram(self.window)
+        return histogram
+
+    def record(
+        self,
+        command: str,
+        latency: float,
+        outcome: str = "success",
+        phases: dict[str, float] | None = None,
+    ) -> None:
+        """Record a finished ``command`` that took ``latency`` milliseconds."""
+        self._histogram(self.commands, command).record(latency)
+        self.overall.record(latency)
+        self.outcomes[command, outcome] += 1
+
+        for name, elapsed in (phases or {}).items():
+            self._histogram(self.phases, (command, outcome, name)).record(elapsed)
+
+    def record_timer(self, command: str, timer: PhaseTimer) -> None:
+        self.record(command, timer.elapsed(), timer.outcome, timer.phases)
+
+
+command_metrics = CommandMetrics(config.metrics.latency_window)
+
+
+class UpstreamMetrics:
+    """Request, error and retry counters for every upstream API, by name."""
+
+    def __init__(self) -> None:
+        self.requests: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.retries: Counter[str] = Counter()
+
+    @contextmanager
+    def track(self, upstream: str) -> Iterator[None]:
+        """Count the enclosed request, and an error if it raises."""
+        self.requests[upstream] += 1
+        try:
+            yield
+        except Exception:
+            self.errors[upstream] += 1
+            raise
+
+    def error_rate(self, upstream: str) -> float:
+        requests = self.requests[upstream]
+        return self.errors[upstream] / requests if requests else 0.0
+
+
+upstream_metrics = UpstreamMetrics()
+
+# Caches, render queues and single-flight groups exported by the metrics
+# endpoint, by name. Caches need ``hits``, ``misses`` and ``hit_rate``;
+# queues are read through a callable returning their current depth.
+caches: dict[str, Any] = {}
+queues: dict[str, Callable[[], int]] = {}
+flights: dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> Any:
+    caches[name] = cache
+    return cache
+
+
+def register_queue(name: str, depth: Callable[[], int]) -> None:
+    queues[name] = depth
+
+
+def register_flight(name: str, flight: Any) -> Any:
+    flights[name] = flight
+    return flight
@@ -0,0 +1,138 @@
+"""Process pool that renders heatmaps and local charts off the event loop."""
+
+import asyncio
+import io
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from config import config
+from services.exceptions import RenderQueueFullError
+from services.metrics import phase, register_queue
+from services.workers import HeatmapStyle, render_chart, render_heatmap, warm_up
+
+
+def rgb_to_mpl(color: str) -> tuple[float, float, float]:
+    """Convert an ``rgb(r, g, b)``/``rgba(...)`` string to a matplotlib color."""
+    red, green, blue = re.findall(r"[\d.]+", color)[:3]
+    return float(red) / 255, float(green) / 255, float(blue) / 255
+
+
+def heatmap_style_from_config() -> HeatmapStyle:
+    chart_style = config.ui.charts.style
+    title = config.ui.charts.plugins.title
+    heatmap_config = config.ui.charts.heatmap
+
+    return HeatmapStyle(
+        background=rgb_to_mpl(chart_style.background),
+        grid_color=rgb_to_mpl(config.ui.charts.scales.grid_color),
+        text_color=rgb_to_mpl(chart_style.text_color),
+        title_color=rgb_to_mpl(title.color),
+        font_size=chart_style.font_size,
+        title_font_size=title.font_size,
+        title_font_weight=title.font_style,
+        border_width=chart_style.border_width,
+        alpha=heatmap_config.alpha,
+        dpi=heatmap_config.dpi,
+        bbox_inches=heatmap_config.bbox_inches,
+        pad_inches=heatmap_config.pad_inches,
+        render_mode=heatmap_config.render_mode,
+        compress_level=heatmap_config.compress_level,
+    )
+
+
+class HeatmapRenderer:
+    """Bounded front-end to a pool of warm render worker processes.
+
+    The workers draw heatmaps and, when charts are rendered locally, charts.
+    At most ``max_pending`` renders are queued or running at once; further
+    requests wait up to ``queue_timeout`` seconds for a slot and then fail
+    with :class:`RenderQueueFullError` instead of piling up.
+    """
+
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float) -> None:
+        self.workers: int = workers
+        self.max_pending: int = max_pending
+        self.queue_timeout: float = queue_timeout
+        self.style: HeatmapStyle = heatmap_style_from_config()
+        self.pending: int = 0
+        self._slots = asyncio.Semaphore(max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def start(self) -> None:
+        """Spawn the worker processes and wait for each to preload its geometry.
+
+        Raises :class:`RuntimeError` if a worker could not preload.
+        """
+        if self._executor is not None:
+            return
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            # Forking a process that runs an event loop and threads is unsafe
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_up,
+        )
+        # Workers are created on demand, so submit one no-op each to spawn them
+        spawned = [self._executor.submit(int) for _ in range(self.workers)]
+        try:
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in spawned))
+        except BrokenProcessPool as e:
+            self.shutdown()
+            raise RuntimeError(
+                "Render workers failed to start, see the worker traceback above"
+            ) from e
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, data: dict, title: str) -> io.BytesIO:
+        """Render a countries heatmap in a worker.
+
+        Returns an in-memory PNG buffer that can be handed straight to
+        ``discord.File``; nothing is written to disk, so concurrent renders
+        never see each other's output.
+        """
+        png = await self._run("heatmap", render_heatmap, data, self.style, title)
+        return io.BytesIO(png)
+
+    async def render_chart(self, payload: dict) -> bytes:
+        """Render a chart API request body in a worker and return the PNG bytes."""
+        return await self._run("chart", render_chart, payload)
+
+    async def _run(self, kind: str, fn: Callable[..., bytes], *args) -> bytes:
+        try:
+            with phase("render_queue"):
+                await asyncio.wait_for(
+                    self._slots.acquire(), timeout=self.queue_timeout
+                )
+        except asyncio.TimeoutError:
+            raise RenderQueueFullError(
+                f"The {kind} renderer is busy, please try again in a moment"
+            ) from None
+
+        self.pending += 1
+        try:
+            await self.start()
+            loop = asyncio.get_running_loop()
+            with phase("render"):
+                return await loop.run_in_executor(self._executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker died; drop the pool so the next render spawns a fresh one
+            self.shutdown()
+            raise
+        finally:
+            self.pending -= 1
+            self._slots.release()
+
+
+heatmap_renderer = HeatmapRenderer(
+    workers=config.render.workers,
+    max_pending=config.render.max_pending,
+    queue_timeout=config.render.queue_timeout,
+)
+register_queue("heatmap", lambda: heatmap_renderer.pending)
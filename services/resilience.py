@@ -0,0 +1,186 @@
+"""Failure isolation for upstream APIs: circuit breakers, retries and deadlines.
+
+Every call to spoo.me or the chart API goes through :func:`call_upstream`.
+Idempotent reads are retried with jittered exponential backoff, an
+upstream that keeps failing is cut off by its circuit breaker so callers
+fail fast, and no attempt may outlive the deadline of the interaction
+that made it.
+"""
+
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Callable, TypeVar
+
+import aiohttp
+import discord
+
+from config import config
+from services.exceptions import CircuitOpenError, DeadlineExceededError
+from services.metrics import upstream_metrics
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling an upstream after ``failure_threshold`` failures in a row.
+
+    While open, calls fail immediately with :class:`CircuitOpenError`. Once
+    ``reset_timeout`` seconds have passed a single probe call is let through:
+    its success closes the circuit again, its failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name: str = name
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.state: str = CLOSED
+        self.failures: int = 0  # In a row
+        self.opens: int = 0
+        self._opened_at: float = 0.0
+        self._probing: bool = False
+
+    def before_call(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a call may go through now."""
+        if self.state == CLOSED:
+            return
+
+        retry_after = self._opened_at + self.reset_timeout - time.monotonic()
+        if self.state == OPEN and retry_after <= 0:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        raise CircuitOpenError(self.name, max(retry_after, 0.0))
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            print(f"Circuit for {self.name} closed")
+        self.state = CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == OPEN:
+            return
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            print(f"Circuit for {self.name} opened after {self.failures} failures")
+            self.state = OPEN
+            self.opens += 1
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give up a call that ended without telling whether the upstream works."""
+        self._probing = False
+
+
+breakers: dict[str, CircuitBreaker] = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=config.resilience.failure_threshold,
+        reset_timeout=config.resilience.reset_timeout,
+    )
+    for name in ("spoo", "charts")
+}
+
+# Wall-clock time by which the current interaction's upstream calls must end
+current_deadline: ContextVar[float | None] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+def start_deadline(interaction: discord.Interaction) -> float:
+    """Bound the current task's upstream calls by the interaction's lifetime.
+
+    Discord expires an interaction's token 15 minutes after it is created,
+    so nothing the bot fetches after that can be sent anyway.
+    """
+    deadline = interaction.created_at.timestamp() + config.resilience.interaction_budget
+    current_deadline.set(deadline)
+    return deadline
+
+
+def time_left() -> float | None:
+    """Seconds until the current deadline, or ``None`` outside of an interaction."""
+    deadline = current_deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Whether ``error`` means the upstream is failing, not that it refused the request."""
+    if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+        return True
+    status = getattr(error, "status", None)
+    return status is not None and (status >= 500 or status == 429)
+
+
+def upstream_unavailable(error: BaseException) -> bool:
+    """Whether ``error`` should be answered with cached or degraded data."""
+    return isinstance(
+        error, (CircuitOpenError, DeadlineExceededError)
+    ) or is_upstream_failure(error)
+
+
+def backoff(attempt: int) -> float:
+    """Full-jitter exponential delay before retry number ``attempt + 1``."""
+    settings = config.resilience
+    ceiling = min(settings.retry_max_delay, settings.retry_base_delay * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+async def call_upstream(
+    upstream: str, fn: Callable[[], Awaitable[T]], idempotent: bool = False
+) -> T:
+    """Await ``fn()`` through ``upstream``'s circuit breaker, within the deadline.
+
+    Idempotent calls failing with a timeout, connection error, 429 or 5xx
+    are retried up to ``resilience.retries`` times, as long as the deadline
+    leaves room for the backoff. Other errors are raised straight away.
+    """
+    breaker = breakers[upstream]
+    attempts = 1 + (config.resilience.retries if idempotent else 0)
+
+    for attempt in range(attempts):
+        remaining = time_left()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"No time left to call {upstream}")
+
+        breaker.before_call()
+        timeout = asyncio.timeout(remaining)
+        try:
+            async with timeout:
+                result = await fn()
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as e:
+            if timeout.expired():
+                # Our own deadline ran out, which says nothing about the upstream
+                breaker.release()
+                raise DeadlineExceededError(
+                    f"{upstream} did not answer before the interaction expired"
+                ) from e
+            if not is_upstream_failure(e):
+                # The upstream answered, it just refused this request
+                breaker.record_success()
+                raise
+
+            breaker.record_failure()
+            delay = backoff(attempt)
+            remaining = time_left()
+            if attempt == attempts - 1 or (
+                remaining is not None and delay >= remaining
+            ):
+                raise
+            upstream_metrics.retries[upstream] += 1
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
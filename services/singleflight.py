@@ -0,0 +1,81 @@
+"""Request coalescing for identical upstream calls."""
+
+import asyncio
+import contextvars
+import time
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from config import config
+from services.exceptions import DeadlineExceededError
+from services.resilience import current_deadline, time_left
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time.
+
+    Callers that ask for a key while its call is still running await that
+    same call instead of starting their own, so a burst of identical
+    requests reaches the upstream once. Nothing is kept after the call
+    finishes; caching results is up to the caller.
+
+    The call belongs to none of its callers: it runs in a fresh context
+    with its own ``resilience.shared_call_budget`` deadline, and each
+    caller stops waiting for it when its own deadline runs out.
+    """
+
+    def __init__(self) -> None:
+        self.calls: int = 0  # Calls actually started
+        self.shared: int = 0  # Callers that joined a call already running
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        """Return the running task for ``key``, starting ``fn()`` if there is none."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+            return task
+
+        self.calls += 1
+        # Not the starting caller's context, or its deadline and phase timer
+        # would apply to everyone who joins
+        context = contextvars.Context()
+        context.run(
+            current_deadline.set, time.time() + config.resilience.shared_call_budget
+        )
+        task = asyncio.create_task(fn(), context=context)
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await the result of ``fn()``, shared with every concurrent caller of ``key``."""
+        task = self.start(key, fn)
+        timeout = asyncio.timeout(time_left())
+        try:
+            async with timeout:
+                # Shield so one cancelled caller does not cancel the call for the others
+                return await asyncio.shield(task)
+        except asyncio.TimeoutError as e:
+            if timeout.expired():
+                raise DeadlineExceededError(
+                    "The shared call did not finish before the interaction expired"
+                ) from e
+            raise
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    @property
+    def share_rate(self) -> float:
+        """Fraction of callers served by a call someone else started."""
+        callers = self.calls + self.shared
+        return self.shared / callers if callers else 0.0
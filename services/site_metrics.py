@@ -0,0 +1,87 @@
+"""Cached spoo.me service-wide metrics, shared by the stats loop and /about."""
+
+import asyncio
+import time
+
+from config import config
+from services.metrics import phase, register_cache, register_flight
+from services.singleflight import SingleFlight
+from services.spoo import SpooClient, spoo_client
+
+
+class SiteMetricsService:
+    """Serves the spoo.me metrics with stale-while-revalidate semantics.
+
+    A value younger than ``ttl`` seconds is returned as is. An older one is
+    still returned immediately while a single background task refreshes it,
+    until it is ``max_stale`` seconds old; past that, callers wait for the
+    refresh, and only get the old value back if it fails.
+    """
+
+    def __init__(self, client: SpooClient, ttl: float, max_stale: float) -> None:
+        self.client: SpooClient = client
+        self.ttl: float = ttl
+        self.max_stale: float = max_stale
+        self.hits: int = 0
+        self.stale_hits: int = 0
+        self.misses: int = 0
+        self._value: dict | None = None
+        self._fetched_at: float = 0.0
+        self.flight: SingleFlight = SingleFlight()
+
+    async def get(self) -> dict:
+        """Return the metrics, from cache unless they are missing or too stale."""
+        age = time.monotonic() - self._fetched_at
+        if self._value is not None and age < self.ttl:
+            self.hits += 1
+            return self._value
+
+        task = self._refresh_task()
+        if self._value is not None and age < self.max_stale:
+            self.stale_hits += 1
+            return self._value
+
+        self.misses += 1
+        try:
+            # Shield so one cancelled caller does not cancel the shared refresh
+            with phase("upstream"):
+                return await asyncio.shield(task)
+        except Exception:
+            if self._value is None:
+                raise
+            # spoo.me is failing: metrics of any age beat none
+            return self._value
+
+    async def refresh(self) -> dict:
+        """Fetch fresh metrics now, joining a refresh that is already running."""
+        with phase("upstream"):
+            return await self.flight.do("metrics", self._fetch)
+
+    def _refresh_task(self) -> asyncio.Task:
+        return self.flight.start("metrics", self._fetch)
+
+    async def _fetch(self) -> dict:
+        try:
+            value = await self.client.fetch_metrics()
+        except Exception as e:
+            # Logged here so background refreshes nobody awaits are not lost
+            print(f"Error fetching stats: {e}")
+            raise
+        self._value = value
+        self._fetched_at = time.monotonic()
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without waiting on spoo.me."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return (self.hits + self.stale_hits) / lookups if lookups else 0.0
+
+
+site_metrics = SiteMetricsService(
+    spoo_client,
+    ttl=config.cache.metrics.ttl,
+    max_stale=config.cache.metrics.max_stale,
+)
+register_cache("site_metrics", site_metrics)
+register_flight("site_metrics", site_metrics.flight)
@@ -0,0 +1,95 @@
+"""Asynchronous client for the spoo.me API."""
+
+from config import config
+from services.exceptions import SpooApiError
+from services.http import get_session
+from services.metrics import phase, upstream_metrics
+from services.resilience import call_upstream
+
+
+class SpooClient:
+    """Non-blocking replacement for ``py_spoo_url.Shortener``.
+
+    Requests go through the shared session, so a slow spoo.me response only
+    delays the interaction waiting on it and never the event loop. They also
+    go through the ``spoo`` circuit breaker, and reads are retried.
+    """
+
+    def __init__(self, base_url: str = config.urls.api_base) -> None:
+        self.base_url: str = base_url.rstrip("/")
+
+    async def _request(self, method: str, url: str, **kwargs) -> dict:
+        with upstream_metrics.track("spoo"):
+            async with get_session().request(
+                method, url, headers={"Accept": "application/json"}, **kwargs
+            ) as response:
+                if response.status != 200:
+                    raise SpooApiError(response.status, await response.text())
+                return await response.json(content_type=None)
+
+    async def _post(self, path: str, payload: dict, idempotent: bool = False) -> dict:
+        with phase("upstream"):
+            return await call_upstream(
+                "spoo",
+                lambda: self._request("POST", f"{self.base_url}{path}", data=payload),
+                idempotent=idempotent,
+            )
+
+    async def _get(self, url: str) -> dict:
+        with phase("upstream"):
+            return await call_upstream(
+                "spoo", lambda: self._request("GET", url), idempotent=True
+            )
+
+    async def shorten(
+        self,
+        long_url: str,
+        alias: str | None = None,
+        max_clicks: int | None = None,
+        password: str | None = None,
+    ) -> str:
+        """Shorten a URL and return the full short URL."""
+        payload = {"url": long_url}
+
+        if password:
+            payload["password"] = password
+        if max_clicks:
+            payload["max_clicks"] = str(max_clicks)
+        if alias:
+            payload["alias"] = alias
+
+        response = await self._post("", payload)
+        return response["short_url"]
+
+    async def emojify(
+        self,
+        long_url: str,
+        emojies: str | None = None,
+        max_clicks: int | None = None,
+        password: str | None = None,
+    ) -> str:
+        """Shorten a URL into an emoji alias and return the full short URL."""
+        payload = {"url": long_url}
+
+        if password:
+            payload["password"] = password
+        if max_clicks:
+            payload["max_clicks"] = str(max_clicks)
+        if emojies:
+            payload["emojies"] = emojies
+
+        response = await self._post("/emoji", payload)
+        return response["short_url"]
+
+    async def fetch_statistics(self, short_code: str, password: str = None) -> dict:
+        """Fetch the raw statistics payload of a short code."""
+        payload = {"password": password} if password else {}
+        # A read, even though the API takes it as a POST
+        return await self._post(f"/stats/{short_code}", payload, idempotent=True)
+
+    async def fetch_metrics(self) -> dict:
+        """Fetch the service-wide metrics (total clicks, shortlinks, ...)."""
+        return await self._get(config.urls.spoo_metrics)
+
+
+spoo_client = SpooClient()
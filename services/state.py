@@ -0,0 +1,158 @@
+"""Key/value state shared between bot clusters.
+
+Backends store JSON-serializable values under string keys, optionally
+with a time-to-live. ``memory`` only lives inside one process and suits
+single-process runs; ``sqlite`` keeps the state in a WAL-mode database
+file so every cluster on the same host sees it.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from config import config
+
+
+class StateBackend(ABC):
+    """Interface every shared state backend implements."""
+
+    @abstractmethod
+    async def get(self, key: str, default: Any = None) -> Any: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None: ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def items(self, prefix: str = "") -> dict[str, Any]:
+        """Return every live entry whose key starts with ``prefix``."""
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStateBackend(StateBackend):
+    """State kept in this process only."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[float | None, Any]] = {}
+
+    def _live(self, key: str) -> bool:
+        expires_at = self._entries[key][0]
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return False
+        return True
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._entries or not self._live(key):
+            return default
+        return self._entries[key][1]
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def items(self, prefix: str = "") -> dict[str, Any]:
+        return {
+            key: self._entries[key][1]
+            for key in list(self._entries)
+            if key.startswith(prefix) and self._live(key)
+        }
+
+
+class SQLiteStateBackend(StateBackend):
+    """State in an SQLite file, shared by every process that opens it.
+
+    Queries are tiny but still touch the disk, so they run in a thread. The
+    file is only opened on first use, so processes that merely import the
+    module (render workers) never hold a connection.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS state "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        db.commit()
+        return db
+
+    def _execute(self, query: str, *params: Any) -> list[tuple]:
+        with self._lock:
+            if self._db is None:
+                self._db = self._connect()
+            rows = self._db.execute(query, params).fetchall()
+            self._db.commit()
+        return rows
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT value FROM state WHERE key = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            key,
+            time.time(),
+        )
+        return json.loads(rows[0][0]) if rows else default
+
+    async def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+            key,
+            json.dumps(value),
+            expires_at,
+        )
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM state WHERE key = ?", key)
+
+    async def items(self, prefix: str = "") -> dict[str, Any]:
+        # Escape LIKE wildcards so the prefix matches literally
+        pattern = (
+            prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        )
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT key, value FROM state WHERE key LIKE ? ESCAPE '\\' "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            pattern,
+            time.time(),
+        )
+        return {key: json.loads(value) for key, value in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def create_state_backend(backend: str, path: str = "") -> StateBackend:
+    """Build the backend named in the config (``memory`` or ``sqlite``)."""
+    if backend == "sqlite":
+        return SQLiteStateBackend(path)
+    return MemoryStateBackend()
+
+
+shared_state = create_state_backend(
+    config.cluster.state_backend, config.cluster.state_path
+)
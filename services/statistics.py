@@ -0,0 +1,144 @@
+"""Cached, non-blocking access to spoo.me URL statistics."""
+
+import copy
+import hashlib
+import time
+from datetime import datetime, timedelta
+
+from config import config
+from services.cache import TTLCache
+from services.metrics import phase, register_cache, register_flight
+from services.resilience import upstream_unavailable
+from services.singleflight import SingleFlight
+from services.spoo import SpooClient, spoo_client
+
+
+def last_n_days(clicks: dict[str, int], days: int) -> dict[str, int]:
+    """Keep the ``YYYY-MM-DD`` keyed clicks from the last ``days`` days."""
+    n_days_ago = (datetime.now() - timedelta(days=days)).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    recent = {
+        date: count
+        for date, count in clicks.items()
+        if datetime.strptime(date, "%Y-%m-%d") >= n_days_ago
+    }
+
+    if not recent:
+        raise ValueError(f"No data available for the last {days} days.")
+    return recent
+
+
+class LinkStatistics:
+    """Parsed statistics of a short URL, with the attributes of ``py_spoo_url.Statistics``.
+
+    The upstream class performs a blocking request in its constructor and
+    imports pandas, geopandas and matplotlib at module level; this one only
+    parses an already fetched payload, so it is cheap to import and safe to
+    build on the event loop. Exports and heatmaps live in their own services.
+    """
+
+    def __init__(self, short_code: str, data: dict) -> None:
+        self.short_code: str = short_code
+        self._url: str = f"{config.urls.api_base}/stats/"
+        self.data: dict = data
+        self.fetched_at: float = time.time()
+        self.stale: bool = False  # Served from an expired entry while spoo.me is down
+
+        self.long_url = data["url"]
+        self.average_daily_clicks = data["average_daily_clicks"]
+        self.average_monthly_clicks = data["average_monthly_clicks"]
+        self.average_weekly_clicks = data["average_weekly_clicks"]
+
+        self.total_clicks = data["total-clicks"]
+        self.total_unique_clicks = data["total_unique_clicks"]
+        self.max_clicks = data["max-clicks"]
+
+        self.last_click = data["last-click"]
+        self.last_click_browser = data["last-click-browser"]
+        self.last_click_platform = data["last-click-os"]
+
+        self.created_at = data["creation-date"]
+        self.creation_time = data.get("creation-time", None)
+
+        self.browsers_analysis = data["browser"]
+        self.platforms_analysis = data["os_name"]
+        self.country_analysis = data["country"]
+        self.referrers_analysis = data["referrer"]
+        self.clicks_analysis = data["counter"]
+
+        self.unique_browsers_analysis = data["unique_browser"]
+        self.unique_platforms_analysis = data["unique_os_name"]
+        self.unique_country_analysis = data["unique_country"]
+        self.unique_referrers_analysis = data["unique_referrer"]
+        self.unique_clicks_analysis = data["unique_counter"]
+
+        self.expired = data["expired"]
+        self.password = data.get("password", None)
+
+    def last_n_days_analysis(self, days: int = 7) -> dict[str, int]:
+        return last_n_days(self.clicks_analysis, days)
+
+    def last_n_days_unique_analysis(self, days: int = 7) -> dict[str, int]:
+        return last_n_days(self.unique_clicks_analysis, days)
+
+
+class StatisticsService:
+    """Fetches URL statistics and keeps parsed results in a TTL/LRU cache.
+
+    Concurrent lookups for the same short code share one upstream request.
+    When spoo.me is unavailable, results that expired from ``cache`` are
+    still served from ``fallback`` (marked ``stale``) rather than failing.
+    """
+
+    def __init__(self, client: SpooClient, cache: TTLCache, fallback: TTLCache) -> None:
+        self.client: SpooClient = client
+        self.cache: TTLCache = cache
+        self.fallback: TTLCache = fallback
+        self.flight: SingleFlight = SingleFlight()
+
+    @staticmethod
+    def _key(short_code: str, password: str | None) -> tuple[str, str | None]:
+        # Never keep plaintext passwords around as cache keys
+        digest = hashlib.sha256(password.encode()).hexdigest() if password else None
+        return short_code, digest
+
+    async def get(self, short_code: str, password: str = None) -> LinkStatistics:
+        """Return statistics for ``short_code``, from cache when fresh."""
+        short_code = short_code.split("/")[-1]
+        key = self._key(short_code, password)
+
+        cached: LinkStatistics | None = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            with phase("upstream"):
+                return await self.flight.do(
+                    key, lambda: self._fetch(short_code, password, key)
+                )
+        except Exception as e:
+            stale: LinkStatistics | None = self.fallback.get(key)
+            if stale is None or not upstream_unavailable(e):
+                raise
+            stale = copy.copy(stale)
+            stale.stale = True
+            return stale
+
+    async def _fetch(
+        self, short_code: str, password: str | None, key: tuple[str, str | None]
+    ) -> LinkStatistics:
+        data = await self.client.fetch_statistics(short_code, password=password)
+        result = LinkStatistics(short_code, data)
+        self.cache.set(key, result)
+        self.fallback.set(key, result)
+        return result
+
+
+statistics_service = StatisticsService(
+    spoo_client,
+    TTLCache(max_size=config.cache.stats.max_size, ttl=config.cache.stats.ttl),
+    TTLCache(max_size=config.cache.stats.max_size, ttl=config.cache.stats.max_stale),
+)
+register_cache("stats", statistics_service.cache)
+register_flight("stats", statistics_service.flight)
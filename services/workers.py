@@ -0,0 +1,46 @@
+"""Entry points of the render worker processes.
+
+The pool pickles these functions by reference, so this module is what every
+worker imports to run a job. It reads no config and builds no service; the
+plotting stack is only imported when a job actually needs it.
+"""
+
+from typing import NamedTuple
+
+
+class HeatmapStyle(NamedTuple):
+    """Picklable heatmap styling, resolved from the config in the bot process."""
+
+    background: tuple[float, float, float]
+    grid_color: tuple[float, float, float]
+    text_color: tuple[float, float, float]
+    title_color: tuple[float, float, float]
+    font_size: int
+    title_font_size: int
+    title_font_weight: str
+    border_width: int
+    alpha: float
+    dpi: int
+    bbox_inches: str
+    pad_inches: float
+    render_mode: str
+    compress_level: int
+
+
+def warm_up() -> None:
+    """Worker initializer; the plotting stack is only ever imported in workers."""
+    from services import heatmap
+
+    heatmap.warm_up()
+
+
+def render_heatmap(data: dict, style: HeatmapStyle, title: str) -> bytes:
+    from services import heatmap
+
+    return heatmap.render_heatmap(data, style, title)
+
+
+def render_chart(payload: dict) -> bytes:
+    from services import chart
+
+    return chart.render_chart(payload)
@@ -1,18 +1,43 @@
-import requests
-from py_spoo_url import Shortener
-from typing import Literal
-import geopandas as gpd
-from mpl_toolkits.axes_grid1 import make_axes_locatable
-import matplotlib.pyplot as plt
-import matplotlib
+import aiohttp
+import asyncio
+import functools
+import hashlib
+import io
+import json
 import discord
 import random
 import datetime
-import aiohttp
-from schemas import ChartHeatmap
+from services import (
+    ChartApiError,
+    ChartCache,
+    ServiceError,
+    SingleFlight,
+    call_upstream,
+    command_metrics,
+    get_session,
+    heatmap_renderer,
+    phase,
+    register_cache,
+    register_flight,
+    register_queue,
+    site_metrics,
+    start_deadline,
+    start_timer,
+    upstream_metrics,
+)
 from config import config
 
-shortener = Shortener()
+chart_cache = ChartCache(
+    max_size=config.cache.charts.max_size,
+    ttl=config.cache.charts.ttl,
+    sqlite_path=config.cache.charts.sqlite_path,
+)
+register_cache("charts", chart_cache)
+chart_semaphore = asyncio.Semaphore(config.http.chart_concurrency)
+chart_pending = 0  # Chart renders waiting for or holding the semaphore
+register_queue("charts", lambda: chart_pending)
+# Identical payloads requested while one is rendering share that render
+chart_flight = register_flight("charts", SingleFlight())
 
 # Use waiting_gifs and welcome_gifs from config
 waiting_gifs = config.assets.waiting_gifs
@@ -47,26 +72,29 @@ def build_commands_help():
 commands_ = build_commands_help()
 
 
-async def fetch_spoo_stats():
-    """Fetch statistics from spoo.me API"""
+async def fetch_spoo_stats(fresh: bool = False):
+    """Fetch statistics from spoo.me API, through the shared metrics cache
+
+    With ``fresh`` the metrics are refetched instead of possibly served stale.
+    """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(config.urls.spoo_metrics) as response:
-                if response.status == 200:
-                    return await response.json()
-    except Exception as e:
-        print(f"Error fetching stats: {e}")
-    return None
+        if fresh:
+            return await site_metrics.refresh()
+        return await site_metrics.get()
+    except Exception:
+        # Already logged by the refresh task
+        return None
 
 
-def generate_chart(
+def build_chart_payload(
     data: list,
     backgrounds: list,
     labels: list,
     title: str,
     type: str,
     fill: bool = True,
-):
+) -> dict:
+    """Build the QuickChart request body for a Chart.js chart."""
     chart_style = config.ui.charts.style
     chart_scales = config.ui.charts.scales
     chart_plugins = config.ui.charts.plugins
@@ -133,86 +161,147 @@ def generate_chart(
             }
         )
 
-    resp = requests.post(
-        config.urls.charts_api_base,
-        json={"chart": data_dict, "v": 4, "backgroundColor": chart_style.background},
-    )
+    return {"chart": data_dict, "v": 4, "backgroundColor": chart_style.background}
+
 
-    return resp.json()
+def chart_cache_key(payload: dict) -> str:
+    """Hash the canonical JSON form of a chart payload."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
 
 
-def generate_countries_heatmap(
-    data,
-    cmap: Literal[
-        "YlOrRd", "viridis", "plasma", "inferno", "RdPu_r", "pink", "turbo"
-    ] = "YlOrRd",
-    alpha: float = None,
-    title: str = "Countries Heatmap",
+async def generate_chart(
+    data: list,
+    backgrounds: list,
+    labels: list,
+    title: str,
+    type: str,
+    fill: bool = True,
 ):
-    heatmap_config: ChartHeatmap = config.ui.charts.heatmap
-    alpha = alpha if alpha is not None else heatmap_config.alpha
-
-    matplotlib.rcParams["font.size"] = config.ui.charts.style.font_size
-    matplotlib.rcParams["axes.labelcolor"] = config.ui.charts.style.text_color
-
-    world = gpd.read_file(gpd.datasets.get_path("naturalearth_lowres"))
-    world = world.merge(
-        gpd.GeoDataFrame(data.items(), columns=["Country", "Value"]),
-        how="left",
-        left_on="name",
-        right_on="Country",
-    )
+    """Draw a chart, through the chart API or the render workers (``render.charts``).
+
+    Returns ``{"success": True, "url": ...}`` for a chart hosted by the chart
+    API, ``{"success": True, "png": ...}`` for one drawn locally, and
+    ``{"success": False, ...}`` when neither worked; ``set_chart_image``
+    handles all three.
+    """
+    payload = build_chart_payload(data, backgrounds, labels, title, type, fill)
+    key = chart_cache_key(payload)
+    mode = config.render.charts
+
+    if mode != "local":
+        # Identical data renders to an identical chart, so skip the network
+        url = chart_cache.get(key)
+        if url is not None:
+            return {"success": True, "url": url}
+
+        try:
+            with phase("render"):
+                remote = chart_flight.do(key, lambda: _render_chart(key, payload))
+                if mode == "fallback":
+                    # A render still running after this keeps going in the
+                    # background and caches its URL for the next request
+                    remote = asyncio.wait_for(
+                        remote, timeout=config.render.chart_fallback_after
+                    )
+                resp = await remote
+            if mode == "remote" or "url" in resp:
+                return resp
+        except (ServiceError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error generating chart: {e!r}")
+            if mode == "remote":
+                # Degrade to an embed without a chart rather than failing the command
+                return {"success": False, "message": str(e)}
 
-    plt.figure(figsize=(15, 10), dpi=heatmap_config.dpi)
-    plt.subplots_adjust(left=0.05, right=0.95, bottom=0.05, top=0.95)
+    try:
+        with phase("render"):
+            png = await chart_flight.do(
+                ("local", key), lambda: heatmap_renderer.render_chart(payload)
+            )
+    except Exception as e:
+        # A full queue, a broken pool or an error raised by the render in the worker
+        print(f"Error rendering chart locally: {e!r}")
+        return {"success": False, "message": str(e)}
+    return {"success": True, "png": png}
 
-    # Create a figure and axis with background color from config
-    background_color = tuple(
-        int(config.ui.charts.style.background.strip("rgb()").split(",")[i]) / 255
-        for i in range(3)
-    )
-    fig, ax = plt.subplots(1, 1, figsize=(15, 10), facecolor=(*background_color, alpha))
 
-    grid_color = tuple(
-        int(config.ui.charts.scales.grid_color.strip("rgb()").split(",")[i]) / 255
-        for i in range(3)
-    )
-    for spine in ax.spines.values():
-        spine.set_color(grid_color)
-        spine.set_linewidth(config.ui.charts.style.border_width)
-
-    ax.tick_params(labelcolor=config.ui.charts.style.text_color)
-
-    world.boundary.plot(ax=ax, linewidth=1)
-    divider = make_axes_locatable(ax)
-    cax = divider.append_axes("right", size="5%", pad=0.1)
-
-    p = world.plot(
-        column="Value",
-        ax=ax,
-        legend=True,
-        cax=cax,
-        cmap=cmap,
-        edgecolor=None,
-        legend_kwds={
-            "label": "Clicks",
-        },
-        alpha=alpha,
-    )
-    p.set_facecolor((*background_color, alpha))
-    cbax = cax
-    cbax.tick_params(labelcolor=config.ui.charts.style.text_color)
-
-    plt.suptitle(
-        title,
-        x=0.5,
-        y=0.82,
-        fontsize=config.ui.charts.plugins.title.font_size,
-        fontweight=config.ui.charts.plugins.title.font_style,
-        color=config.ui.charts.plugins.title.color,
-    )
+async def _render_chart(key: str, payload: dict) -> dict:
+    global chart_pending
+    chart_pending += 1
+    try:
+        # The same payload always renders the same chart, so it is safe to retry
+        resp = await call_upstream(
+            "charts", lambda: _post_chart(payload), idempotent=True
+        )
+    finally:
+        chart_pending -= 1
+
+    if "url" in resp:
+        chart_cache.set(key, resp["url"])
+
+    return resp
+
+
+async def _post_chart(payload: dict) -> dict:
+    async with chart_semaphore:
+        with upstream_metrics.track("charts"):
+            async with get_session().post(
+                config.urls.charts_api_base, json=payload
+            ) as response:
+                if response.status != 200:
+                    raise ChartApiError(response.status, await response.text())
+                try:
+                    return await response.json(content_type=None)
+                except (ValueError, aiohttp.ContentTypeError) as e:
+                    # Proxies and outages can answer 200 with an HTML page
+                    raise ChartApiError(
+                        response.status, f"Invalid JSON response: {e}"
+                    ) from e
+
+
+def set_chart_image(embed: discord.Embed, resp: dict) -> discord.File | None:
+    """Show a chart returned by ``generate_chart``, or say why there is none.
+
+    A chart drawn locally is returned as a file that has to be sent along
+    with the embed.
+    """
+    if "url" in resp:
+        embed.set_image(url=resp["url"])
+    elif "png" in resp:
+        embed.set_image(url="attachment://chart.png")
+        return discord.File(io.BytesIO(resp["png"]), filename="chart.png")
+    else:
+        embed.add_field(
+            name="Chart Unavailable ⚠️",
+            value="```The chart service is not responding right now, try again later.```",
+            inline=False,
+        )
+    return None
+
+
+def timed_interaction(name: str):
+    """Time a view component callback like an app command, recorded as ``name``.
+
+    The callback can mark its phases with ``services.phase`` and set
+    ``timer.outcome`` on the current timer when it handles a failure itself.
+    """
+
+    def decorator(callback):
+        @functools.wraps(callback)
+        async def wrapper(self, interaction: discord.Interaction, *args):
+            timer = interaction.extras["timer"] = start_timer()
+            start_deadline(interaction)
+            try:
+                return await callback(self, interaction, *args)
+            except Exception:
+                timer.outcome = "error"
+                raise
+            finally:
+                command_metrics.record_timer(name, timer)
+
+        return wrapper
 
-    return plt
+    return decorator
 
 
 async def generate_error_message(
@@ -1,78 +1,169 @@
-import json
-from typing import Literal
+from json.encoder import encode_basestring_ascii as encode_string
+from typing import Callable
 import re
 import validators
 
-available_languages: list[str] = [
-    "Python-Requests",
-    "Python-Aiohttp",
-    "C",
-    "C#",
-    "Clojure",
-    "Go",
-    "HTTP",
-    "Java",
-    "JavaScript-Fetch",
-    "JavaScript-XMLHttpRequest",
-    "Kotlin",
-    "Node.js-Requests",
-    "Node.js-Axios",
-    "Node.js-Unirest",
-    "PHP",
-    "R",
-    "Ruby",
-    "Shell",
-    "Rust",
-]
+# Normalized request body: ordered (field, value) pairs, always starting with "url"
+Payload = list[tuple[str, str]]
+
+
+class CodeTemplate:
+    """A code snippet template for one language.
+
+    ``source`` uses ``str.format`` syntax. ``{long_url}`` is always available,
+    any other field is produced by ``fields`` from the normalized payload.
+    """
+
+    __slots__ = ("language", "syntax", "filename", "source", "fields")
+
+    def __init__(
+        self,
+        language: str,
+        syntax: str,
+        source: str,
+        fields: Callable[[Payload], dict[str, object]],
+        extension: str = "txt",
+    ) -> None:
+        self.language: str = language
+        self.syntax: str = syntax
+        # e.g. "C#" -> "csharp.cs", "Node.js-Axios" -> "node-js-axios.js"
+        slug = re.sub(r"[^a-z0-9]+", "-", language.lower().replace("#", "sharp"))
+        self.filename: str = f"{slug.strip('-')}.{extension}"
+        self.source: str = source
+        self.fields: Callable[[Payload], dict[str, object]] = fields
+
+    def render(self, payload: Payload) -> str:
+        values = self.fields(payload)
+        values["long_url"] = payload[0][1]
+        return self.source.format_map(values)
+
+
+code_templates: dict[str, CodeTemplate] = {}
+available_languages: list[str] = []
+
+
+def register_code_template(
+    language: str,
+    syntax: str,
+    source: str,
+    fields: Callable[[Payload], dict[str, object]] = lambda payload: {},
+    extension: str = "txt",
+) -> CodeTemplate:
+    """Register (or replace) the snippet template for ``language``.
+
+    ``syntax`` is the code block language used for highlighting on Discord and
+    ``extension`` the file extension used when snippets are bundled as files.
+    """
+    template = CodeTemplate(language, syntax, source, fields, extension)
+    if language not in code_templates:
+        available_languages.append(language)
+    code_templates[language] = template
+    return template
+
+
+def normalize_payload(
+    long_url: str,
+    alias: str = None,
+    password: str = None,
+    max_clicks: int = None,
+) -> Payload:
+    payload: Payload = [("url", long_url)]
+
+    if alias is not None:
+        payload.append(("alias", alias))
+    if password is not None:
+        payload.append(("password", password))
+    if max_clicks is not None:
+        payload.append(("max-clicks", str(max_clicks)))
+
+    return payload
 
 
 def generate_code_snippet(
-    language: Literal[
-        "Python-Requests",
-        "Python-Aiohttp",
-        "C",
-        "C#",
-        "Clojure",
-        "Go",
-        "HTTP",
-        "Java",
-        "JavaScript-Fetch",
-        "JavaScript-XMLHttpRequest",
-        "Kotlin",
-        "Node.js-Requests",
-        "Node.js-Axios",
-        "Node.js-Unirest",
-        "PHP",
-        "R",
-        "Ruby",
-        "Shell",
-        "Rust",
-    ] = "Python-Requests",
+    language: str = "Python-Requests",
     long_url: str = "https://example.com",
     alias: str = None,
     password: str = None,
     max_clicks: int = None,
-):
-    if language == "Python-Requests":
-        payload = {
-            "url": long_url,
+) -> tuple[str, str]:
+    """Return the ``(code, syntax)`` snippet to shorten ``long_url`` in ``language``."""
+    template = code_templates[language]
+    payload = normalize_payload(long_url, alias, password, max_clicks)
+    return template.render(payload), template.syntax
+
+
+# Field builders shared by the templates below
+
+
+def json_payload(payload: Payload) -> dict[str, object]:
+    # Same output as json.dumps(dict(payload), indent=4) for this flat string
+    # mapping, without going through the pure-Python indenting encoder
+    items = ",\n    ".join(
+        [f"{encode_string(key)}: {encode_string(value)}" for key, value in payload]
+    )
+    return {"payload": f"{{\n    {items}\n}}"}
+
+
+def joined_params(
+    item: str, separator: str, quote_dashed: bool = False
+) -> Callable[[Payload], dict[str, object]]:
+    """Build ``form_params`` by formatting every field with ``item`` and joining them.
+
+    With ``quote_dashed``, keys that are not valid identifiers (``max-clicks``)
+    are single-quoted, as JavaScript object literals need.
+    """
+
+    def build(payload: Payload) -> dict[str, object]:
+        if quote_dashed:
+            payload = [
+                (f"'{key}'" if "-" in key else key, value) for key, value in payload
+            ]
+        return {
+            "form_params": separator.join(
+                [item.format(key=key, value=value) for key, value in payload]
+            )
+        }
+
+    return build
+
+
+def query_string(payload: Payload) -> dict[str, object]:
+    form_params = "&".join([f"{key}={value}" for key, value in payload])
+    return {"form_params": form_params, "content_length": len(form_params)}
+
+
+def extra_query_params(concat: str = "") -> Callable[[Payload], dict[str, object]]:
+    """Build ``form_params`` from every field but the URL, which templates encode themselves.
+
+    ``concat`` additionally renders the params as ``url_suffix``, for templates
+    that only append them to the encoded URL when there are any.
+    """
+
+    def build(payload: Payload) -> dict[str, object]:
+        form_params = "".join([f"&{key}={value}" for key, value in payload[1:]])
+        return {
+            "form_params": form_params,
+            "url_suffix": concat.format(params=form_params) if form_params else "",
         }
 
-        if alias is not None:
-            payload["alias"] = alias
-        if password is not None:
-            payload["password"] = password
-        if max_clicks is not None:
-            payload["max-clicks"] = str(max_clicks)
+    return build
+
+
+def rust_params(payload: Payload) -> dict[str, object]:
+    inserts = "".join(
+        [f'params.insert("{key}", "{value}");\n        ' for key, value in payload]
+    )
+    return {"form_params": f"\n        {inserts}"}
 
-        payload_str = json.dumps(payload, indent=4)
 
-        return (
-            f"""import requests
+register_code_template(
+    "Python-Requests",
+    "python",
+    """import requests
 
 url = "https://spoo.me/"
 
-payload = {payload_str}
+payload = {payload}
 headers = {{
     "Accept": "application/json",
 }}
@@ -83,30 +174,19 @@ if response.status_code == 200:
     print(response.json())
 else:
     print(response.text)""",
-            "python",
-        )
-
-    elif language == "Python-Aiohttp":
-        payload = {
-            "url": long_url,
-        }
-
-        if alias is not None:
-            payload["alias"] = alias
-        if password is not None:
-            payload["password"] = password
-        if max_clicks is not None:
-            payload["max-clicks"] = str(max_clicks)
-
-        payload_str = json.dumps(payload, indent=4)
+    json_payload,
+    extension="py",
+)
 
-        return (
-            f"""import aiohttp
+register_code_template(
+    "Python-Aiohttp",
+    "python",
+    """import aiohttp
 import asyncio
 
 url = "https://spoo.me/"
 
-payload = {payload_str}
+payload = {payload}
 headers = {{
     "Accept": "application/json",
 }}
@@ -120,21 +200,14 @@ async def main():
                 print(await response.text())
 
 asyncio.run(main())""",
-            "python",
-        )
-
-    elif language == "C":
-        payload = f"url={long_url}"
-
-        if alias is not None:
-            payload += f"&alias={alias}"
-        if password is not None:
-            payload += f"&password={password}"
-        if max_clicks is not None:
-            payload += f"&max-clicks={max_clicks}"
+    json_payload,
+    extension="py",
+)
 
-        return (
-            f"""CURL *hnd = curl_easy_init();
+register_code_template(
+    "C",
+    "c",
+    """CURL *hnd = curl_easy_init();
 
 curl_easy_setopt(hnd, CURLOPT_CUSTOMREQUEST, "POST");
 curl_easy_setopt(hnd, CURLOPT_URL, "https://spoo.me/");
@@ -143,46 +216,19 @@ struct curl_slist *headers = NULL;
 headers = curl_slist_append(headers, "Accept: application/json");
 curl_easy_setopt(hnd, CURLOPT_HTTPHEADER, headers);
 
-char *output = curl_easy_escape(hnd, "{payload}", 0);
+char *output = curl_easy_escape(hnd, "{form_params}", 0);
 curl_easy_setopt(hnd, CURLOPT_POSTFIELDS, output);
 curl_free(output);
 
 CURLcode ret = curl_easy_perform(hnd);""",
-            "c",
-        )
-
-    elif language == "Clojure":
-        form_params = f':url "{long_url}"'
-
-        if alias is not None:
-            form_params += f' :alias "{alias}"'
-        if password is not None:
-            form_params += f' :password "{password}"'
-        if max_clicks is not None:
-            form_params += f' :max-clicks "{max_clicks}"'
-
-        return (
-            f"""
-(require '[clj-http.client :as client])
-
-(client/post "https://spoo.me/" {{:form-params {{{form_params}}}
-                                :accept :json}})
-""",
-            "clojure",
-        )
-
-    elif language == "C#":
-        form_params = f'{{ "url", "{long_url}" }}'
-
-        if alias is not None:
-            form_params += f', {{ "alias", "{alias}" }}'
-        if password is not None:
-            form_params += f', {{ "password", "{password}" }}'
-        if max_clicks is not None:
-            form_params += f', {{ "max-clicks", "{max_clicks}" }}'
+    query_string,
+    extension="c",
+)
 
-        return (
-            f"""using System.Net.Http;
+register_code_template(
+    "C#",
+    "csharp",
+    """using System.Net.Http;
 using System.Net.Http.Headers;
 using System.Collections.Generic;
 
@@ -213,21 +259,27 @@ catch (HttpRequestException ex)
 {{
     Console.WriteLine($"HTTP request error: {{ex.Message}}");
 }}""",
-            "csharp",
-        )
+    joined_params('{{ "{key}", "{value}" }}', ", "),
+    extension="cs",
+)
 
-    elif language == "Go":
-        form_params = ""
+register_code_template(
+    "Clojure",
+    "clojure",
+    """
+(require '[clj-http.client :as client])
 
-        if alias is not None:
-            form_params += f"&alias={alias}"
-        if password is not None:
-            form_params += f"&password={password}"
-        if max_clicks is not None:
-            form_params += f"&max-clicks={max_clicks}"
+(client/post "https://spoo.me/" {{:form-params {{{form_params}}}
+                                :accept :json}})
+""",
+    joined_params(':{key} "{value}"', " "),
+    extension="clj",
+)
 
-        return (
-            f"""package main
+register_code_template(
+    "Go",
+    "go",
+    """package main
 
 import (
     "context"
@@ -254,7 +306,7 @@ func main() {{
     longUrl := "{long_url}"
     encodedLongUrl := url.QueryEscape(longUrl)
 
-    payload := strings.NewReader("url="+encodedLongUrl{f'+"{form_params}"' if form_params != "" else ""})
+    payload := strings.NewReader("url="+encodedLongUrl{url_suffix})
 
     req, err := http.NewRequest("POST", apiUrl, payload)
     if err != nil {{
@@ -281,43 +333,29 @@ func main() {{
     fmt.Println(res)
     fmt.Println(string(body))
 }}""",
-            "go",
-        )
-
-    elif language == "HTTP":
-        form_params = f"url={long_url}"
-
-        if alias is not None:
-            form_params += f"&alias={alias}"
-        if password is not None:
-            form_params += f"&password={password}"
-        if max_clicks is not None:
-            form_params += f"&max-clicks={max_clicks}"
+    extra_query_params('+"{params}"'),
+    extension="go",
+)
 
-        return (
-            f"""
+register_code_template(
+    "HTTP",
+    "",
+    """
 POST / HTTP/1.1
 Content-Type: application/x-www-form-urlencoded
 Accept: application/json
 Host: spoo.me
-Content-Length: {len(form_params)}
+Content-Length: {content_length}
 
 {form_params}""",
-            "",
-        )
-
-    elif language == "Java":
-        form_params = ""
-
-        if alias is not None:
-            form_params += f"&alias={alias}"
-        if password is not None:
-            form_params += f"&password={password}"
-        if max_clicks is not None:
-            form_params += f"&max-clicks={max_clicks}"
+    query_string,
+    extension="http",
+)
 
-        return (
-            f"""import java.net.URI;
+register_code_template(
+    "Java",
+    "java",
+    """import java.net.URI;
 import java.net.URLEncoder;
 import java.net.http.HttpClient;
 import java.net.http.HttpRequest;
@@ -337,7 +375,7 @@ public class HttpRequestExample {{
         String encodedLongUrl = URLEncoder.encode(longUrl, StandardCharsets.UTF_8);
 
         // Build the request body
-        String requestBody = "url="+encodedLongUrl{f'+"{form_params}"' if form_params != "" else ""};
+        String requestBody = "url="+encodedLongUrl{url_suffix};
 
         // Create and configure the HttpClient
         HttpClient httpClient = HttpClient.newHttpClient();
@@ -362,21 +400,14 @@ public class HttpRequestExample {{
         }}
     }}
 }}""",
-            "java",
-        )
-
-    elif language == "JavaScript-Fetch":
-        form_params = f"url: '{long_url}'"
-
-        if alias is not None:
-            form_params += f",\n\t\talias: '{alias}'"
-        if password is not None:
-            form_params += f",\n\t\tpassword: '{password}'"
-        if max_clicks is not None:
-            form_params += f",\n\t\t'max-clicks': '{max_clicks}'"
+    extra_query_params('+"{params}"'),
+    extension="java",
+)
 
-        return (
-            f"""const url = 'https://spoo.me/';
+register_code_template(
+    "JavaScript-Fetch",
+    "js",
+    """const url = 'https://spoo.me/';
 const options = {{
     method: 'POST',
     headers: {{
@@ -404,21 +435,14 @@ async function shortUrl() {{
     }}
 }}
 shortUrl();""",
-            "js",
-        )
-
-    elif language == "JavaScript-XMLHttpRequest":
-        form_params = f"data.append('url', '{long_url}');"
-
-        if alias is not None:
-            form_params += f"\ndata.append('alias', '{alias}');"
-        if password is not None:
-            form_params += f"\ndata.append('password', '{password}');"
-        if max_clicks is not None:
-            form_params += f"\ndata.append('max-clicks', '{max_clicks}');"
+    joined_params("{key}: '{value}'", ",\n\t\t", quote_dashed=True),
+    extension="js",
+)
 
-        return (
-            f"""const url = 'https://spoo.me/';
+register_code_template(
+    "JavaScript-XMLHttpRequest",
+    "js",
+    """const url = 'https://spoo.me/';
 const data = new URLSearchParams();
 {form_params}
 
@@ -438,21 +462,14 @@ xhr.onreadystatechange = function () {{
 }};
 
 xhr.send(data);""",
-            "js",
-        )
-
-    elif language == "Kotlin":
-        form_params = ""
-
-        if alias is not None:
-            form_params += f"&alias={alias}"
-        if password is not None:
-            form_params += f"&password={password}"
-        if max_clicks is not None:
-            form_params += f"&max-clicks={max_clicks}"
+    joined_params("data.append('{key}', '{value}');", "\n"),
+    extension="js",
+)
 
-        return (
-            f"""import okhttp3.HttpUrl
+register_code_template(
+    "Kotlin",
+    "kotlin",
+    """import okhttp3.HttpUrl
 import okhttp3.MediaType.Companion.toMediaType
 import okhttp3.OkHttpClient
 import okhttp3.Request
@@ -466,7 +483,7 @@ fun main() {{
 
     val encodedUrl = HttpUrl.parse(originalUrl)?.encodedPath
 
-    val body = "url=$encodedUrl{form_params if form_params != "" else ""}".toRequestBody(mediaType)
+    val body = "url=$encodedUrl{form_params}".toRequestBody(mediaType)
 
     val request = Request.Builder()
         .url("https://spoo.me/")
@@ -487,21 +504,14 @@ fun main() {{
         }}
     }}
 }}""",
-            "kotlin",
-        )
-
-    elif language == "Node.js-Requests":
-        form_params = f"url: '{long_url}'"
-
-        if alias is not None:
-            form_params += f",\n    alias: '{alias}'"
-        if password is not None:
-            form_params += f",\n    password: '{password}'"
-        if max_clicks is not None:
-            form_params += f",\n    'max-clicks': '{max_clicks}'"
+    extra_query_params(),
+    extension="kt",
+)
 
-        return (
-            f"""const request = require('request');
+register_code_template(
+    "Node.js-Requests",
+    "js",
+    """const request = require('request');
 
 const options = {{
     method: 'POST',
@@ -520,21 +530,14 @@ request(options, function (error, response, body) {{
 
     console.log(body);
 }});""",
-            "js",
-        )
-
-    elif language == "Node.js-Axios":
-        form_params = f"url: '{long_url}'"
-
-        if alias is not None:
-            form_params += f",\n    alias: '{alias}'"
-        if password is not None:
-            form_params += f",\n    password: '{password}'"
-        if max_clicks is not None:
-            form_params += f",\n    'max-clicks': '{max_clicks}'"
+    joined_params("{key}: '{value}'", ",\n    ", quote_dashed=True),
+    extension="js",
+)
 
-        return (
-            f"""const axios = require('axios');
+register_code_template(
+    "Node.js-Axios",
+    "js",
+    """const axios = require('axios');
 
 const data = {{
     {form_params}
@@ -554,21 +557,14 @@ axios.post('https://spoo.me/', data, {{
 .catch(function (error) {{
     console.error(error);
 }});""",
-            "js",
-        )
-
-    elif language == "Node.js-Unirest":
-        form_params = f"url: '{long_url}'"
-
-        if alias is not None:
-            form_params += f",\n    alias: '{alias}'"
-        if password is not None:
-            form_params += f",\n    password: '{password}'"
-        if max_clicks is not None:
-            form_params += f",\n    'max-clicks': '{max_clicks}'"
+    joined_params("{key}: '{value}'", ",\n    ", quote_dashed=True),
+    extension="js",
+)
 
-        return (
-            f"""var unirest = require('unirest');
+register_code_template(
+    "Node.js-Unirest",
+    "js",
+    """var unirest = require('unirest');
 
 var req = unirest('POST', 'https://spoo.me/');
 req.headers({{
@@ -585,21 +581,14 @@ req.headers({{
 
     console.log(res.body);
 }});""",
-            "js",
-        )
-
-    elif language == "PHP":
-        form_params = f"'url' => '{long_url}'"
-
-        if alias is not None:
-            form_params += f", 'alias' => '{alias}'"
-        if password is not None:
-            form_params += f", 'password' => '{password}'"
-        if max_clicks is not None:
-            form_params += f", 'max-clicks' => '{max_clicks}'"
+    joined_params("{key}: '{value}'", ",\n    ", quote_dashed=True),
+    extension="js",
+)
 
-        return (
-            f"""<?php
+register_code_template(
+    "PHP",
+    "php",
+    """<?php
 
 $curl = curl_init();
 
@@ -634,21 +623,14 @@ if ($err) {{
 }} else {{
     echo $response;
 }}""",
-            "php",
-        )
-
-    elif language == "R":
-        form_params = ""
-
-        if alias is not None:
-            form_params += f"&alias={alias}"
-        if password is not None:
-            form_params += f"&password={password}"
-        if max_clicks is not None:
-            form_params += f"&max-clicks={max_clicks}"
+    joined_params("'{key}' => '{value}'", ", "),
+    extension="php",
+)
 
-        return (
-            f"""library(httr)
+register_code_template(
+    "R",
+    "r",
+    """library(httr)
 
 url <- "https://spoo.me"
 
@@ -658,7 +640,7 @@ long_url <- "{long_url}"
 # encode the long url
 encoded_long_url <- URLencode(long_url)
 
-payload <- paste("url=", encoded_long_url{f', "{form_params}"' if form_params != "" else ""}, sep="")
+payload <- paste("url=", encoded_long_url{url_suffix}, sep="")
 
 encode <- "form"
 
@@ -673,21 +655,14 @@ tryCatch({{
 }}, error = function(e) {{
     cat("Error: ", conditionMessage(e), "\\n")
 }})""",
-            "r",
-        )
-
-    elif language == "Ruby":
-        form_params = ""
-
-        if alias is not None:
-            form_params += f"&alias={alias}"
-        if password is not None:
-            form_params += f"&password={password}"
-        if max_clicks is not None:
-            form_params += f"&max-clicks={max_clicks}"
+    extra_query_params(', "{params}"'),
+    extension="r",
+)
 
-        return (
-            f"""require 'uri'
+register_code_template(
+    "Ruby",
+    "ruby",
+    """require 'uri'
 require 'net/http'
 
 url = URI("https://spoo.me")
@@ -701,45 +676,29 @@ encodedLongUrl = URI.encode_www_form_component(longUrl)
 request = Net::HTTP::Post.new(url)
 request["content-type"] = 'application/x-www-form-urlencoded'
 request["Accept"] = 'application/json'
-request.body = "url=#{"{encodedLongUrl}"}{form_params}"
+request.body = "url=#{{encodedLongUrl}}{form_params}"
 
 response = http.request(request)
 puts response.read_body""",
-            "ruby",
-        )
-
-    elif language == "Shell":
-        form_params = ""
-
-        if alias is not None:
-            form_params += f"&alias={alias}"
-        if password is not None:
-            form_params += f"&password={password}"
-        if max_clicks is not None:
-            form_params += f"&max-clicks={max_clicks}"
+    extra_query_params(),
+    extension="rb",
+)
 
-        return (
-            f"""curl -X POST "https://spoo.me/" \\
+register_code_template(
+    "Shell",
+    "shell",
+    """curl -X POST "https://spoo.me/" \\
 -H "Accept: application/json" \\
 -H "Content-Type: application/x-www-form-urlencoded" \\
 -d "url=$(echo -n '{long_url}' | jq -sRr @uri){form_params}" """,
-            "shell",
-        )
-
-    elif language == "Rust":
-        form_params = f"""
-        params.insert("url", "{long_url}");
-        """
-
-        if alias is not None:
-            form_params += f'params.insert("alias", "{alias}");\n        '
-        if password is not None:
-            form_params += f'params.insert("password", "{password}");\n        '
-        if max_clicks is not None:
-            form_params += f'params.insert("max-clicks", "{max_clicks}");\n        '
-
-        return (
-            f"""use reqwest::blocking::Client;
+    extra_query_params(),
+    extension="sh",
+)
+
+register_code_template(
+    "Rust",
+    "rust",
+    """use reqwest::blocking::Client;
 use std::collections::HashMap;
 
 fn main() {{
@@ -767,8 +726,9 @@ fn main() {{
         Err(err) => eprintln!("HTTP request error: {{}}", err),
     }}
 }}""",
-            "rust",
-        )
+    rust_params,
+    extension="rs",
+)
 
 
 def validate_password(password):